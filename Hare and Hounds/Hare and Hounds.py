@@ -1,14 +1,30 @@
-import copy
+import sys
 import time
-from cmath import sqrt
 
 import pygame
-from scipy.spatial.distance import cityblock
+
+from hare_hounds import RECORD_MAX_DEPTH, Board, Game, GameRecordWriter, MoveCache, MoveProfiler, ProofNumberSearch, \
+    Solve, alpha_beta, cacheMemoryFromEnvironment, classicBoard, defaultCacheMemory, defaultWeights, encodeMove, \
+    initialGame, min_max, otherPlayer, profileDirectoryFromEnvironment, proofNodesPerDepth, proofNumberMove, \
+    recordSettings, repetitionsFromHistory, replayGameRecords
+from hare_hounds_tools import benchmarkBatchMoves, benchmarkBoards, benchmarkParallelSearch, benchmarkProofNumber, \
+    benchmarkRepetitions, heuristicWeightsFile, loadHeuristicWeights, runRegression, tuneHeuristicWeights
+
+
+# the computer does not search again the tables already reached in the game (off: the repetitions are found on the
+# table only, without the vertical moves of the hounds, so they cut the lines where the hare plays for the win with
+# 10 vertical moves; --repetitions shows that the engine is weaker with them)
+repetitionDetection = False
+
+
+# the size of a cell on the pygame display (smaller cells for the bigger boards)
+def gridCellSize(board):
+    return min(150, 1200 // board.columns, 750 // board.rows)
 
 
 # for pygame
-def drawGrid(display, gameTable):
-    w_gr = h_gr = 150
+def drawGrid(display, gameTable, board):
+    w_gr = h_gr = gridCellSize(board)
 
     houndImage = pygame.image.load('hounds.png')
     houndImage = pygame.transform.scale(houndImage, (w_gr - 10, h_gr - 10))
@@ -16,8 +32,8 @@ def drawGrid(display, gameTable):
     hareImage = pygame.transform.scale(hareImage, (w_gr - 10, h_gr - 10))
 
     drt = []
-    for row in range(3):
-        for column in range(5):
+    for row in range(board.rows):
+        for column in range(board.columns):
 
             grid = pygame.Rect(column * (w_gr + 1), row * (h_gr + 1), w_gr, h_gr)
             drt.append(grid)
@@ -32,448 +48,58 @@ def drawGrid(display, gameTable):
     xImage = pygame.image.load('ics.png')
     xImage = pygame.transform.scale(xImage, (w_gr - 10, h_gr - 10))
 
-    for [row, column] in [[0, 0], [2, 0], [0, 4], [2, 4]]:
+    for [row, column] in board.impossibleMoves:
         display.blit(xImage, (column * w_gr + 5, row * h_gr + 5))
 
     pygame.display.flip()
     return drt
 
 
-# returns all possible moves; 8 directions
-def allMoves(row, column):
-    # top
-    topMove = [row - 1, column]
-    # top-right
-    topRightMove = [row - 1, column + 1]
-    # right
-    rightMove = [row, column + 1]
-    # bottom-right
-    bottomRightMove = [row + 1, column + 1]
-    # bottom
-    bottomMove = [row + 1, column]
-    # bottom-left
-    bottomLeftMove = [row + 1, column - 1]
-    # left
-    leftMove = [row, column - 1]
-    # top-left
-    topLeftMove = [row - 1, column - 1]
-
-    return [topMove, topRightMove, rightMove, bottomRightMove, bottomMove, bottomLeftMove, leftMove, topLeftMove]
-
-
-# if given positions are within the bounds of the game board
-def withinBounds(positionX, positionY):
-    if 0 <= positionX < 3 and 0 <= positionY < 5:
-        return True
-    return False
-
-
-class Game:
-    # player symbols
-    playerSymbols = ['c', 'i']
-
-    # the game table
-    gameTable = [[' ', 1, 4, 7, ' '],
-                 [0, 2, 5, 8, 10],
-                 [' ', 3, 6, 9, ' ']]
-
-    # the empty space on the matrix
-    gameGoal = '*'
-
-    impossibleMoves = [[0, 0], [2, 0], [0, 4], [2, 4]]  # the edges from the matrix where is an empty space
-
-    # can not move (from) -> (to) because those positions are not connected between them
-    # I did not exclude the ones that are the same as in hare movement because the hounds can not go backwards
-    houndsInvalidMoves = [[(1, 1), (0, 2)],
-                          [(1, 1), (2, 2)],
-                          [(0, 2), (1, 3)],
-                          [(2, 2), (1, 3)]]
-
-    # the hare can move in any direction so I exclude every direction possible of invalid movements
-    hareInvalidMovements = houndsInvalidMoves + [[(0, 2), (1, 1)],
-                                                 [(2, 2), (1, 1)],
-                                                 [(1, 3), (0, 2)],
-                                                 [(1, 3), (2, 2)]]
-    JMIN = None
-    JMAX = None
-
-    def __init__(self, table, houndsVerticalMoves):
-        self.table = table  # current table during the game
-        self.houndsVerticalMoves = houndsVerticalMoves
-
-    # finding the position of a hare on the table
-    # symbol is a string of 'c' or 'i'
-    def findSymbolPosition(self, symbol):
-        for i in range(3):
-            for j in range(5):
-                if self.table[i][j] == symbol:
-                    return i, j
-        return -1, -1
-
-    def getPositionFromGameTable(self, position):
-        for i in range(3):
-            for j in range(5):
-                if self.gameTable[i][j] == position:
-                    return i, j
-        return -1, -1
-
-    # given coordinates where to go, check if from the current position, you can reach the given destination
-    # function used for checking the user's input
-    def checkIfYouCanGo(self, currentPlayer, rowDestinationToReach, columnDestinationToReach,
-                        rowHoundFrom=None,
-                        columnHoundFrom=None):  # used when a hound moves so whe know which one to move
-        if currentPlayer == 'i':
-            rowFrom, colFrom = self.findSymbolPosition('i')
-            # if the move from the current position to the destination (from input) is reachable
-            if self.legalMove(currentPlayer, rowFrom, colFrom, rowDestinationToReach, columnDestinationToReach):
-                return True
-        else:
-            # if the move from the current position to the destination (from input) is reachable
-            if self.legalMove(currentPlayer, rowHoundFrom, columnHoundFrom, rowDestinationToReach,
-                              columnDestinationToReach):
-                return True
-
-        return False
-
-    # function to check if the current player movement is valid from their current position to given coordinates
-    def legalMove(self, currentPlayer, rowFrom, colFrom, rowTo, colTo):
-        # to check how far apart is the current position from the position to go
-        rowDiff = abs(rowFrom - rowTo)
-        colDiff = abs(colFrom - colTo)
-
-        # if the position is greater than 1, then it is an invalid position to go
-        if rowDiff > 1 or colDiff > 1:
-            return False
-
-        if not withinBounds(rowTo, colTo):
-            return False
-
-        if currentPlayer == 'c':
-            if colTo - colFrom < 0:  # hounds can not move behind their current position
-                return False
-            # if they can move with a valid movement and the position is not occupied already
-            if self.table[rowTo][colTo] == self.gameGoal:
-                if [rowTo, colTo] not in self.impossibleMoves:
-                    for invalidMovement in self.houndsInvalidMoves:
-                        if [(rowFrom, colFrom), (rowTo, colTo)] == invalidMovement:
-                            return False
-
-        # the hare can move in any direction without any restriction of their current position and the next position
-        if currentPlayer == 'i':
-            # if they can move with a valid movement and the position is not occupied already
-            if self.table[rowTo][colTo] == self.gameGoal:
-                if [rowTo, colTo] not in self.impossibleMoves:
-                    for invalidMovement in self.hareInvalidMovements:
-                        if [(rowFrom, colFrom), (rowTo, colTo)] == invalidMovement:
-                            return False
-
-        return True
-
-    # function to generate the next moves from the current position of the current player
-    def generateNextMoves(self, currentPlayer):
-        movesList = []
-
-        if currentPlayer == 'i':  # hare
-            rowFrom, colFrom = self.findSymbolPosition(currentPlayer)
-            if rowFrom != -1 and colFrom != -1:
-                hareMoves = allMoves(rowFrom, colFrom)  # hare movements are almost in every direction
-                for [rowTo, colTo] in hareMoves:
-                    if withinBounds(rowTo, colTo) and self.table[rowTo][colTo] == Game.gameGoal:
-                        if self.legalMove(currentPlayer, rowFrom, colFrom, rowTo, colTo):
-                            # creating a new table game with current settings
-                            newTableGame = copy.deepcopy(self.table)
-                            # setting current position to empty space
-                            newTableGame[rowFrom][colFrom] = self.gameGoal
-                            # moving the position of the player
-                            newTableGame[rowTo][colTo] = currentPlayer
-                            movesList.append(Game(newTableGame, self.houndsVerticalMoves))
-
-        if currentPlayer == 'c':
-            for i in range(3):  # finding the positions of the all hounds
-                for j in range(5):
-                    if self.table[i][j] == 'c':
-                        rowFrom, colFrom = i, j
-                        houndMoves = allMoves(rowFrom, colFrom)
-                        for [rowTo, colTo] in houndMoves:
-                            if withinBounds(rowTo, colTo) and self.table[rowTo][colTo] == Game.gameGoal:
-                                if self.legalMove(currentPlayer, rowFrom, colFrom, rowTo, colTo):
-                                    # creating a new table game with current settings
-                                    newTableGame = copy.deepcopy(self.table)
-                                    # setting current position to empty space
-                                    newTableGame[rowFrom][colFrom] = self.gameGoal
-                                    # moving the position of the player
-                                    newTableGame[rowTo][colTo] = currentPlayer
-                                    # if they move vertically all the time
-                                    if colFrom == colTo:
-                                        movesList.append(Game(newTableGame, self.houndsVerticalMoves + 1))
-                                    else:
-                                        movesList.append(Game(newTableGame, 0))
-
-        return movesList
-
-    def finalGame(self):
-        if self.houndsVerticalMoves >= 10:
-            return 'i'
-
-        rowFrom, colFrom = self.findSymbolPosition('i')
-        # if all hounds are after the hare, then the hare wins
-        houndsNumber = 0
-        if rowFrom != -1 and colFrom != -1:
-            for i in range(3):
-                for j in range(5):
-                    if self.table[i][j] == 'c' and j > colFrom:
-                        houndsNumber += 1
-
-        if houndsNumber == 3:
-            return 'i'
-
-        # find if the hare is surrounded by hounds, then the hounds can still win
-        ok = 0
-        directions = allMoves(rowFrom, colFrom)
-        if rowFrom != -1 and colFrom != -1:
-            for [rowTo, colTo] in directions:
-                if withinBounds(rowTo, colTo):
-                    # find if there is a valid move to a empty place to move for hare so it is not game over for her
-                    if self.table[rowTo][colTo] == self.gameGoal:
-                        if self.legalMove('i', rowFrom, colFrom, rowTo, colTo):
-                            ok = 1
-                            break
-        if ok == 0:
-            return 'c'
-
-        return False  # the game is not finished yet
-
-    # score estimation using euclidean distance
-    # it is used for a easier game
-    def scoreCalculation2(self, currentPlayer):
-        rowFromHare, colFromHare = self.findSymbolPosition('i')
-
-        houndsPositions = []
-        for i in range(3):
-            for j in range(5):
-                if self.table[i][j] == 'c':
-                    houndsPositions.append([i, j])
-
-        # euclidean distance
-        distanceHound1 = (
-            sqrt((houndsPositions[0][0] - rowFromHare) ** 2 + (houndsPositions[0][1] - colFromHare) ** 2)).real
-        distanceHound2 = (
-            sqrt((houndsPositions[1][0] - rowFromHare) ** 2 + (houndsPositions[1][1] - colFromHare) ** 2)).real
-        distanceHound3 = (
-            sqrt((houndsPositions[2][0] - rowFromHare) ** 2 + (houndsPositions[2][1] - colFromHare) ** 2)).real
-
-        if currentPlayer == 'i':
-            score = 0
-            if colFromHare > houndsPositions[0][1]:
-                score += distanceHound1 - 1  # points for being away from hounds
-            elif colFromHare == houndsPositions[0][1]:
-                score += distanceHound1
-            else:
-                score += 5  # bonus points if he passes a hound
-
-            if colFromHare > houndsPositions[1][1]:
-                score += distanceHound2 - 1
-            elif colFromHare == houndsPositions[1][1]:
-                score += distanceHound2
-            else:
-                score += 5  # bonus points if he passes a hound
-
-            if colFromHare > houndsPositions[2][1]:
-                score += distanceHound3 - 1
-            elif colFromHare == houndsPositions[2][1]:
-                score += distanceHound3
-            else:
-                score += 5  # bonus points if he passes a hound
-        else:
-            # calculating the mean distance between the hounds and the hare
-            score = (distanceHound1 + distanceHound2 + distanceHound3) / 3
-        return score
-
-    # score estimation using manhattan distance
-    # it is used for a harder game
-    def scoreCalculation(self, currentPlayer):
-        rowFromHare, colFromHare = self.findSymbolPosition('i')
-        harePosition = [[rowFromHare, colFromHare]]
-        houndsPositions = []
-        for i in range(3):
-            for j in range(5):
-                if self.table[i][j] == 'c':
-                    houndsPositions.append([i, j])
-
-        # manhattan distance (a bit better because it is a grid style)
-        distanceHound1 = cityblock(houndsPositions[0], harePosition[0])
-        distanceHound2 = cityblock(houndsPositions[1], harePosition[0])
-        distanceHound3 = cityblock(houndsPositions[2], harePosition[0])
-
-        if currentPlayer == 'i':
-            score = 0
-            if colFromHare > houndsPositions[0][1]:
-                score += distanceHound1 - 1
-            elif colFromHare == houndsPositions[0][1]:
-                score += distanceHound1
-            else:
-                score += 5  # bonus points if he passes a hound
-
-            if colFromHare > houndsPositions[1][1]:
-                score += distanceHound2 - 1
-            elif colFromHare == houndsPositions[1][1]:
-                score += distanceHound2
-            else:
-                score += 5  # bonus points if he passes a hound
-
-            if colFromHare > houndsPositions[2][1]:
-                score += distanceHound3 - 1
-            elif colFromHare == houndsPositions[2][1]:
-                score += distanceHound3
-            else:
-                score += 5  # bonus points if he passes a hound
-        else:
-            score = (distanceHound1 + distanceHound2 + distanceHound3) / 3
-            # how far apart are the hounds
-            distanceHound12 = cityblock(houndsPositions[0], houndsPositions[1])
-            distanceHound13 = cityblock(houndsPositions[0], houndsPositions[2])
-            distanceHound23 = cityblock(houndsPositions[1], houndsPositions[2])
-
-            # grouping them together => dropping useless states that can lose the game
-            score -= distanceHound12 + distanceHound13 + distanceHound23
-        return score
-
-    # a harder game (7-10 difficulty)
-    def heuristicCalculation(self):
-        return self.scoreCalculation(self.JMAX) - self.scoreCalculation(self.JMIN)
-
-    # a bit easier game (1-6 difficulty)
-    def heuristicCalculation2(self):
-        return self.scoreCalculation2(self.JMAX) - self.scoreCalculation2(self.JMIN)
-
-    def scoreEstimation(self, depth, difficulty):
-        t_final = self.finalGame()
-        if t_final == self.JMAX:
-            return 999 + depth
-        elif t_final == self.JMIN:
-            return -999 - depth
-        else:
-            if 1 <= difficulty <= 6:
-                return self.heuristicCalculation2()
-            else:
-                return self.heuristicCalculation()
-
-
-# Solve class is not changing during the game
-class Solve:
-    maxDepth = None
-
-    # Solve constructor
-    def __init__(self, gameTable, currentGame, depth, score=None):
-        self.gameTable = gameTable  # Game type
-        self.currentGame = currentGame  # current player game
-        self.currentDepth = depth
-        self.currentScore = score
-        self.listOfPossibleMovesOfCurrentGame = []
-        self.chosenMove = None
-
-    def __str__(self):
-        return str(self.gameTable) + "(Current game: " + self.currentGame + ")\n"
-
-    # function to change the current player
-    def changePlayer(self):
-        if self.currentGame == Game.JMIN:
-            return Game.JMAX
-        else:
-            return Game.JMIN
-
-    def startMoving(self):
-        # Generate the moves for the current game
-        movesOfCurrentGame = self.gameTable.generateNextMoves(self.currentGame)
-        otherPlayer = self.changePlayer()  # change the current player
-        # generate the list of moves for the changed player
-        listOfMoves = [Solve(oneMove, otherPlayer, self.currentDepth - 1) for oneMove in movesOfCurrentGame]
-
-        return listOfMoves
-
-
 def printFinalOfGame(currentState):  # currentState -> Solve Type
     winner = currentState.gameTable.finalGame()
     if winner:
         print("Winner is: " + winner)
-        print("Score of player: " + str(currentState.gameTable.scoreCalculation(Game.JMIN)))
-        print("Score of computer: " + str(currentState.gameTable.scoreCalculation(Game.JMAX)))
+        print("Score of player: " + str(currentState.gameTable.scoreCalculation(otherPlayer(currentState.playerMax))))
+        print("Score of computer: " + str(currentState.gameTable.scoreCalculation(currentState.playerMax)))
         return True
     return False
 
 
-# min_max function algorithm
-# difficulty = the difficulty of the game
-def min_max(currentState, difficulty):  # stare -> Solve type
-    if currentState.currentDepth == 0 or currentState.gameTable.finalGame():
-        currentState.currentScore = currentState.gameTable.scoreEstimation(currentState.currentDepth, difficulty)
-        return currentState
-
-    currentState.listOfPossibleMovesOfCurrentGame = currentState.startMoving()
-
-    scoreAfterMoving = [min_max(oneMove, difficulty) for oneMove in currentState.listOfPossibleMovesOfCurrentGame]
-
-    if currentState.currentGame == Game.JMAX:
-        currentState.chosenMove = max(scoreAfterMoving, key=lambda x: x.currentScore)
+# writes the game in the game records (if the game is recorded)
+# a game left with exit or by closing the window is written with no winner
+def recordGame(recordWriter, algorithm, difficulty, recordedMoves, currentState):
+    if recordWriter is not None:
+        recordWriter.writeGame(recordSettings(algorithm, difficulty, currentState.currentDepth,
+                                              otherPlayer(currentState.playerMax)),
+                               recordedMoves, currentState.gameTable.finalGame())
+
+
+# the next position after the computer's move
+# with alpha-beta on the harder difficulties (above difficultySplit) a forced win found by the proof-number search is
+# played at once; min_max and the easier difficulties always use the search with the chosen depth
+# proofSearch = the ProofNumberSearch of the game (its table is kept between the moves, so a proven win is played
+# until the end of the game)
+def chooseComputerMove(currentState, algorithm, difficulty, proofSearch):
+    if algorithm == '2' and difficulty > currentState.gameTable.weights.difficultySplit:
+        nextGame, proofStats = proofNumberMove(currentState.gameTable, currentState.playerMax,
+                                               proofNodesPerDepth * currentState.currentDepth, proofSearch=proofSearch)
+        if nextGame is not None:
+            print("Forced win found by the proof-number search ({} positions).".format(proofStats['nodes']))
+            return nextGame
+
+    if algorithm == '1':
+        stare_actualizata = min_max(currentState, difficulty)
     else:
-        currentState.chosenMove = min(scoreAfterMoving, key=lambda x: x.currentScore)
-
-    currentState.currentScore = currentState.chosenMove.currentScore
-
-    return currentState
-
-
-# alpha beta function algorithm
-def alpha_beta(alpha, beta, currentState, difficulty):
-    if currentState.currentDepth == 0 or currentState.gameTable.finalGame():
-        currentState.currentScore = currentState.gameTable.scoreEstimation(currentState.currentDepth, difficulty)
-        return currentState
-
-    if alpha > beta:
-        return currentState
-
-    currentState.listOfPossibleMovesOfCurrentGame = currentState.startMoving()
-
-    if currentState.currentGame == Game.JMAX:
-        currentScore = float('-inf')
-
-        for oneMove in currentState.listOfPossibleMovesOfCurrentGame:
-            newState = alpha_beta(alpha, beta, oneMove, difficulty)
-
-            if currentScore < newState.currentScore:
-                currentState.chosenMove = newState
-                currentScore = newState.currentScore
-
-            if alpha < newState.currentScore:
-                alpha = newState.currentScore
-                if alpha >= beta:
-                    break
-
-    elif currentState.currentGame == Game.JMIN:
-        currentScore = float('inf')
-
-        for oneMove in currentState.listOfPossibleMovesOfCurrentGame:
-            newState = alpha_beta(alpha, beta, oneMove, difficulty)
-
-            if currentScore > newState.currentScore:
-                currentState.chosenMove = newState
-                currentScore = newState.currentScore
-
-            if beta > newState.currentScore:
-                beta = newState.currentScore
-                if alpha >= beta:
-                    break
-
-    currentState.currentScore = currentState.chosenMove.currentScore
-
-    return currentState
+        stare_actualizata = alpha_beta(-5000, 5000, currentState, difficulty)
+    return stare_actualizata.chosenMove.gameTable
 
 
 # function to exit anytime by typing "exit"
-def exitFunction(currentState):
+# runTimeBefore = the time (in ms) when the game started
+def exitFunction(currentState, runTimeBefore):
     print("You have exited the game! Final configuration of the game:")
-    for i in range(3):
-        for j in range(5):
+    for i in range(currentState.gameTable.board.rows):
+        for j in range(currentState.gameTable.board.columns):
             print(currentState.gameTable.table[i][j], end=' ')
         print(end='\n')
     runTimeAfterExit = int(round(time.time() * 1000))
@@ -482,7 +108,12 @@ def exitFunction(currentState):
 
 
 # function to start the min-max algorithm
-def startPlayingConsole(currentState, algorithm, difficulty):
+# profiler = MoveProfiler around every search of the computer (None - no profiling)
+def startPlayingConsole(currentState, algorithm, difficulty, runTimeBefore, recordWriter=None, profiler=None):
+    playerMax = currentState.playerMax  # the computer
+    playerMin = otherPlayer(playerMax)  # the player
+    board = currentState.gameTable.board
+
     # to avoid warnings
     rowDestination = -1
     columnDestination = -1
@@ -491,19 +122,22 @@ def startPlayingConsole(currentState, algorithm, difficulty):
 
     playerMoves = 0
     computerMoves = 0
+    recordedMoves = []  # the moves of the game, encoded for the game records
+    gameHistory = []  # the positions before every move, with the player that moved (for the repetitions)
+    proofSearch = ProofNumberSearch()  # the proof-number search of the computer's moves
     while True:
         print("Current player: " + currentState.currentGame)
         # player's turn
-        if currentState.currentGame == Game.JMIN:
+        if currentState.currentGame == playerMin:
 
             playerMoves += 1
             print("Choose a position to move accordingly to this: ")
-            for i in range(3):
-                for j in range(5):
-                    print(Game.gameTable[i][j], end=' ')
+            for i in range(board.rows):
+                for j in range(board.columns):
+                    print(board.gameTable[i][j], end=' ')
                 print(end='\n')
 
-            if Game.JMIN == 'i':  # hare move
+            if playerMin == 'i':  # hare move
                 positionFound = False
                 while not positionFound:
                     try:
@@ -511,16 +145,17 @@ def startPlayingConsole(currentState, algorithm, difficulty):
                         if positionToMoveTo == "exit":
                             print("Player total moves: " + str(playerMoves))
                             print("Computer total moves: " + str(computerMoves))
-                            exitFunction(currentState)
+                            recordGame(recordWriter, algorithm, difficulty, recordedMoves, currentState)
+                            exitFunction(currentState, runTimeBefore)
                         else:
                             positionToMoveTo = int(positionToMoveTo)
 
-                        if positionToMoveTo in range(11):
+                        if positionToMoveTo in range(board.cellsNumber):
                             rowDestination, columnDestination = currentState.gameTable.getPositionFromGameTable(
                                 positionToMoveTo)  # finding the position (x, y) on the table
                             print("\n")
                             # check if the chosen position is valid
-                            if currentState.gameTable.checkIfYouCanGo(Game.JMIN, rowDestination,
+                            if currentState.gameTable.checkIfYouCanGo(playerMin, rowDestination,
                                                                       columnDestination) is True and \
                                     currentState.gameTable.table[rowDestination][columnDestination] == Game.gameGoal:
                                 positionFound = True
@@ -529,7 +164,8 @@ def startPlayingConsole(currentState, algorithm, difficulty):
                                 print("You can not reach this position!")
                         else:
                             print(
-                                "Please, choose between 0 - 10 accordingly to the table position presented or type exit!")
+                                "Please, choose between 0 - {} accordingly to the table position presented or type exit!"
+                                .format(board.cellsNumber - 1))
 
                     except ValueError:
                         print("Insert a positive integer!")
@@ -543,12 +179,13 @@ def startPlayingConsole(currentState, algorithm, difficulty):
                         if positionOfChosenHound == "exit" or positionToMoveTo == "exit":
                             print("Player total moves: " + str(playerMoves))
                             print("Computer total moves: " + str(computerMoves))
-                            exitFunction(currentState)
+                            recordGame(recordWriter, algorithm, difficulty, recordedMoves, currentState)
+                            exitFunction(currentState, runTimeBefore)
                         else:
                             positionOfChosenHound = int(positionOfChosenHound)
                             positionToMoveTo = int(positionToMoveTo)
 
-                        if (positionToMoveTo and positionOfChosenHound) in range(11):
+                        if (positionToMoveTo and positionOfChosenHound) in range(board.cellsNumber):
                             rowDestination, columnDestination = currentState.gameTable.getPositionFromGameTable(
                                 positionToMoveTo)
 
@@ -556,7 +193,7 @@ def startPlayingConsole(currentState, algorithm, difficulty):
                                 positionOfChosenHound)
 
                             if currentState.gameTable.table[rowHoundFrom][colHoundFrom] == 'c':
-                                if currentState.gameTable.checkIfYouCanGo(Game.JMIN, rowDestination, columnDestination,
+                                if currentState.gameTable.checkIfYouCanGo(playerMin, rowDestination, columnDestination,
                                                                           rowHoundFrom, colHoundFrom) is True and \
                                         currentState.gameTable.table[rowDestination][
                                             columnDestination] == Game.gameGoal:
@@ -568,33 +205,24 @@ def startPlayingConsole(currentState, algorithm, difficulty):
                                 print("You do not have a player on this position!")
                         else:
                             print(
-                                "Please, choose between 0 - 10 accordingly to the table position presented or type exit!")
+                                "Please, choose between 0 - {} accordingly to the table position presented or type exit!"
+                                .format(board.cellsNumber - 1))
 
                     except ValueError:
                         print("Insert a positive integer!")
 
             # Place the chosen position on the table
-            if Game.JMIN == 'c':
-                currentState.gameTable.table[rowDestination][columnDestination] = Game.JMIN
-                currentState.gameTable.table[rowHoundFrom][colHoundFrom] = Game.gameGoal
-
-                # count how many times the hound moved vertically
-                if columnDestination == colHoundFrom:
-                    currentState.gameTable.houndsVerticalMoves += 1
-                else:
-                    currentState.gameTable.houndsVerticalMoves = 0
-            else:
-                for i in range(3):
-                    for j in range(5):
-                        if currentState.gameTable.table[i][j] == 'i':
-                            currentState.gameTable.table[i][j] = Game.gameGoal
-                            break
-                currentState.gameTable.table[rowDestination][columnDestination] = Game.JMIN
+            if playerMin == 'i':
+                rowHoundFrom, colHoundFrom = currentState.gameTable.findSymbolPosition('i')
+            gameHistory.append((currentState.gameTable.copy(), playerMin))
+            recordedMoves.append(encodeMove(board.gameTable[rowHoundFrom][colHoundFrom],
+                                            board.gameTable[rowDestination][columnDestination]))
+            currentState.gameTable.makeMove(playerMin, rowHoundFrom, colHoundFrom, rowDestination, columnDestination)
 
             # Table after the player's move
             print("\nTable after the player's move: ")
-            for i in range(3):
-                for j in range(5):
+            for i in range(board.rows):
+                for j in range(board.columns):
                     print(currentState.gameTable.table[i][j], end=' ')
                 print(end='\n')
 
@@ -602,6 +230,7 @@ def startPlayingConsole(currentState, algorithm, difficulty):
             if printFinalOfGame(currentState):
                 print("Player total moves: " + str(playerMoves))
                 print("Computer total moves: " + str(computerMoves))
+                recordGame(recordWriter, algorithm, difficulty, recordedMoves, currentState)
                 break
 
             # change the player
@@ -612,16 +241,21 @@ def startPlayingConsole(currentState, algorithm, difficulty):
             computerMoves += 1
             timerBeforeStart = int(round(time.time() * 1000))
 
-            if algorithm == '1':
-                stare_actualizata = min_max(currentState, difficulty)
-            elif algorithm == '2':
-                stare_actualizata = alpha_beta(-5000, 5000, currentState, difficulty)
+            if repetitionDetection:
+                currentState.repetitions = repetitionsFromHistory(gameHistory)
+            gameHistory.append((currentState.gameTable.copy(), playerMax))
+            if profiler is not None:
+                profiler.startMove()
+            nextGame = chooseComputerMove(currentState, algorithm, difficulty, proofSearch)
+            if profiler is not None:
+                print("Profile of the computer's move: " + profiler.endMove())
 
-            currentState.gameTable = stare_actualizata.chosenMove.gameTable
+            recordedMoves.append(encodeMove(*currentState.gameTable.findMoveTo(nextGame, playerMax)))
+            currentState.gameTable = nextGame
 
             print("The table after the computer's move")
-            for i in range(3):
-                for j in range(5):
+            for i in range(board.rows):
+                for j in range(board.columns):
                     print(currentState.gameTable.table[i][j], end=' ')
                 print(end='\n')
 
@@ -633,13 +267,19 @@ def startPlayingConsole(currentState, algorithm, difficulty):
             if printFinalOfGame(currentState):
                 print("Player total moves: " + str(playerMoves))
                 print("Computer total moves: " + str(computerMoves))
+                recordGame(recordWriter, algorithm, difficulty, recordedMoves, currentState)
                 break
 
             # change player
             currentState.currentGame = currentState.changePlayer()
 
 
-def startPlayingPyGame(currentState, algorithm, currentTable, difficulty):
+def startPlayingPyGame(currentState, algorithm, currentTable, difficulty, runTimeBefore, recordWriter=None,
+                       profiler=None):
+    playerMax = currentState.playerMax  # the computer
+    playerMin = otherPlayer(playerMax)  # the player
+    board = currentState.gameTable.board
+
     # to avoid warnings
     rowDestination = -1
     columnDestination = -1
@@ -648,13 +288,16 @@ def startPlayingPyGame(currentState, algorithm, currentTable, difficulty):
 
     playerMoves = 0
     computerMoves = 0
+    recordedMoves = []  # the moves of the game, encoded for the game records
+    gameHistory = []  # the positions before every move, with the player that moved (for the repetitions)
+    proofSearch = ProofNumberSearch()  # the proof-number search of the computer's moves
 
     # start pygame
     pygame.init()
     pygame.display.set_caption('Hounds and hare')
-    display = pygame.display.set_mode((750, 450))
+    display = pygame.display.set_mode((board.columns * gridCellSize(board), board.rows * gridCellSize(board)))
 
-    gamePrint = drawGrid(display, currentTable.table)
+    gamePrint = drawGrid(display, currentTable.table, board)
 
     houndSelected = False
     turnDone = False  # current player's turn done
@@ -662,13 +305,13 @@ def startPlayingPyGame(currentState, algorithm, currentTable, difficulty):
 
     while True:
         # player's turn
-        if currentState.currentGame == Game.JMIN:
+        if currentState.currentGame == playerMin:
 
-            if Game.JMIN == 'i' and not prompter:
+            if playerMin == 'i' and not prompter:
                 prompter = True
                 print("Player's turn.")
                 print("Click on a position to move the hare.")
-            elif Game.JMIN == 'c' and not prompter:
+            elif playerMin == 'c' and not prompter:
                 prompter = True
                 print("Player's turn.")
                 print("Click on a hound and then a position to move the hound.")
@@ -678,9 +321,10 @@ def startPlayingPyGame(currentState, algorithm, currentTable, difficulty):
                 if event.type == pygame.QUIT:
                     print("Player total moves: " + str(playerMoves))
                     print("Computer total moves: " + str(computerMoves))
+                    recordGame(recordWriter, algorithm, difficulty, recordedMoves, currentState)
 
-                    print("Score of player: " + str(currentState.gameTable.scoreCalculation(Game.JMIN)))
-                    print("Score of computer: " + str(currentState.gameTable.scoreCalculation(Game.JMAX)))
+                    print("Score of player: " + str(currentState.gameTable.scoreCalculation(playerMin)))
+                    print("Score of computer: " + str(currentState.gameTable.scoreCalculation(playerMax)))
 
                     runTimeAfter = int(round(time.time() * 1000))
                     print("\n\nTime passed while playing the game: " + str(runTimeAfter - runTimeBefore) + " ms.")
@@ -688,15 +332,15 @@ def startPlayingPyGame(currentState, algorithm, currentTable, difficulty):
                     pygame.quit()
                     exit(5)
 
-                if Game.JMIN == 'i':  # hare move
+                if playerMin == 'i':  # hare move
                     if event.type == pygame.MOUSEBUTTONDOWN:
                         clickedPosition = pygame.mouse.get_pos()
 
                         for i in range(len(gamePrint)):
                             if gamePrint[i].collidepoint(clickedPosition):
-                                rowDestination = i // 5
-                                columnDestination = i % 5
-                                if currentState.gameTable.checkIfYouCanGo(Game.JMIN, rowDestination,
+                                rowDestination = i // board.columns
+                                columnDestination = i % board.columns
+                                if currentState.gameTable.checkIfYouCanGo(playerMin, rowDestination,
                                                                           columnDestination) and \
                                         currentState.gameTable.table[rowDestination][
                                             columnDestination] == Game.gameGoal:
@@ -712,8 +356,8 @@ def startPlayingPyGame(currentState, algorithm, currentTable, difficulty):
 
                         for i in range(len(gamePrint)):
                             if gamePrint[i].collidepoint(clickedPosition):
-                                rowHoundFrom = i // 5
-                                columnHoundFrom = i % 5
+                                rowHoundFrom = i // board.columns
+                                columnHoundFrom = i % board.columns
                                 if currentState.gameTable.table[rowHoundFrom][columnHoundFrom] == 'c':
                                     houndSelected = True
                                     break
@@ -726,9 +370,9 @@ def startPlayingPyGame(currentState, algorithm, currentTable, difficulty):
 
                         for i in range(len(gamePrint)):
                             if gamePrint[i].collidepoint(clickedPosition):
-                                rowDestination = i // 5
-                                columnDestination = i % 5
-                                if currentState.gameTable.checkIfYouCanGo(Game.JMIN, rowDestination, columnDestination,
+                                rowDestination = i // board.columns
+                                columnDestination = i % board.columns
+                                if currentState.gameTable.checkIfYouCanGo(playerMin, rowDestination, columnDestination,
                                                                           rowHoundFrom, columnHoundFrom) and \
                                         currentState.gameTable.table[rowDestination][
                                             columnDestination] == Game.gameGoal:
@@ -741,29 +385,20 @@ def startPlayingPyGame(currentState, algorithm, currentTable, difficulty):
                 if turnDone:
                     playerMoves += 1
 
-                    if Game.JMIN == 'c':
-                        currentState.gameTable.table[rowDestination][columnDestination] = Game.JMIN
-                        currentState.gameTable.table[rowHoundFrom][columnHoundFrom] = Game.gameGoal
+                    if playerMin == 'i':
+                        rowHoundFrom, columnHoundFrom = currentState.gameTable.findSymbolPosition('i')
+                    gameHistory.append((currentState.gameTable.copy(), playerMin))
+                    recordedMoves.append(encodeMove(board.gameTable[rowHoundFrom][columnHoundFrom],
+                                                    board.gameTable[rowDestination][columnDestination]))
+                    currentState.gameTable.makeMove(playerMin, rowHoundFrom, columnHoundFrom, rowDestination,
+                                                    columnDestination)
 
-                        # count how many times the hound moved vertically
-                        if columnDestination == columnHoundFrom:
-                            currentState.gameTable.houndsVerticalMoves += 1
-                        else:
-                            currentState.gameTable.houndsVerticalMoves = 0
-                    else:
-                        for i in range(3):
-                            for j in range(5):
-                                if currentState.gameTable.table[i][j] == 'i':
-                                    currentState.gameTable.table[i][j] = Game.gameGoal
-                                    break
-                        currentState.gameTable.table[rowDestination][columnDestination] = Game.JMIN
-
-                    gamePrint = drawGrid(display, currentState.gameTable.table)
+                    gamePrint = drawGrid(display, currentState.gameTable.table, board)
 
                     # Table after the player's move
                     print("\nTable after the player's move: ")
-                    for i in range(3):
-                        for j in range(5):
+                    for i in range(board.rows):
+                        for j in range(board.columns):
                             print(currentState.gameTable.table[i][j], end=' ')
                         print(end='\n')
 
@@ -771,9 +406,10 @@ def startPlayingPyGame(currentState, algorithm, currentTable, difficulty):
                     if printFinalOfGame(currentState):
                         print("Player total moves: " + str(playerMoves))
                         print("Computer total moves: " + str(computerMoves))
+                        recordGame(recordWriter, algorithm, difficulty, recordedMoves, currentState)
 
-                        print("Score of player: " + str(currentState.gameTable.scoreCalculation(Game.JMIN)))
-                        print("Score of computer: " + str(currentState.gameTable.scoreCalculation(Game.JMAX)))
+                        print("Score of player: " + str(currentState.gameTable.scoreCalculation(playerMin)))
+                        print("Score of computer: " + str(currentState.gameTable.scoreCalculation(playerMax)))
 
                         runTimeAfter = int(round(time.time() * 1000))
                         print("\n\nTime passed while playing the game: " + str(runTimeAfter - runTimeBefore) + " ms.")
@@ -792,14 +428,19 @@ def startPlayingPyGame(currentState, algorithm, currentTable, difficulty):
             # start timer
             timerBeforeStart = int(round(time.time() * 1000))
 
-            if algorithm == '1':
-                stare_actualizata = min_max(currentState, difficulty)
-            elif algorithm == '2':
-                stare_actualizata = alpha_beta(-5000, 5000, currentState, difficulty)
+            if repetitionDetection:
+                currentState.repetitions = repetitionsFromHistory(gameHistory)
+            gameHistory.append((currentState.gameTable.copy(), playerMax))
+            if profiler is not None:
+                profiler.startMove()
+            nextGame = chooseComputerMove(currentState, algorithm, difficulty, proofSearch)
+            if profiler is not None:
+                print("Profile of the computer's move: " + profiler.endMove())
 
-            currentState.gameTable = stare_actualizata.chosenMove.gameTable
+            recordedMoves.append(encodeMove(*currentState.gameTable.findMoveTo(nextGame, playerMax)))
+            currentState.gameTable = nextGame
 
-            gamePrint = drawGrid(display, currentState.gameTable.table)
+            gamePrint = drawGrid(display, currentState.gameTable.table, board)
 
             # timer after the algorithm finishes the execution for this current state of the game
             timeAfterStart = int(round(time.time() * 1000))
@@ -807,8 +448,8 @@ def startPlayingPyGame(currentState, algorithm, currentTable, difficulty):
 
             # Table after the computer's move
             print("\nTable after the computer's move: ")
-            for i in range(3):
-                for j in range(5):
+            for i in range(board.rows):
+                for j in range(board.columns):
                     print(currentState.gameTable.table[i][j], end=' ')
                 print(end='\n')
 
@@ -816,9 +457,10 @@ def startPlayingPyGame(currentState, algorithm, currentTable, difficulty):
             if printFinalOfGame(currentState):
                 print("Player total moves: " + str(playerMoves))
                 print("Computer total moves: " + str(computerMoves))
+                recordGame(recordWriter, algorithm, difficulty, recordedMoves, currentState)
 
-                print("Score of player: " + str(currentState.gameTable.scoreCalculation(Game.JMIN)))
-                print("Score of computer: " + str(currentState.gameTable.scoreCalculation(Game.JMAX)))
+                print("Score of player: " + str(currentState.gameTable.scoreCalculation(playerMin)))
+                print("Score of computer: " + str(currentState.gameTable.scoreCalculation(playerMax)))
 
                 runTimeAfter = int(round(time.time() * 1000))
                 print("\n\nTime passed while playing the game: " + str(runTimeAfter - runTimeBefore) + " ms.")
@@ -847,30 +489,47 @@ def chooseAlgorithmRead():
     return chosenAlgorithm
 
 
-# function to set the max depth
+# function to set the max depth (it is stored in one byte of the game records)
 def chooseMaxDepthRead():
     chosenDepth = False
     while not chosenDepth:
         n = input("Max depth of the tree: ")
-        if n.isdigit():
+        if n.isdigit() and 1 <= int(n) <= RECORD_MAX_DEPTH:
             return int(n)
         else:
-            print("Choose a positive integer.")
+            print("Choose an integer between 1 and {}.".format(RECORD_MAX_DEPTH))
 
 
 def choosePlayerRead():
     [s1, s2] = Game.playerSymbols.copy()
     selected = False
     while not selected:
-        Game.JMIN = str(input("Play as a {} or as a {}? ".format(s1, s2))).lower()
-        if Game.JMIN in Game.playerSymbols:
-            selected = True
+        playerMin = str(input("Play as a {} or as a {}? ".format(s1, s2))).lower()
+        if playerMin in Game.playerSymbols:
+            return playerMin
         else:
             print("Choose between {} or {}.".format(s1, s2))
-    Game.JMAX = s1 if Game.JMIN == s2 else s2
 
 
-def main():
+# profileDirectory = write the profile of every computer's move and the summary of the game in a new directory of the
+# game inside this directory (the profiling is also turned on by the HARE_HOUNDS_PROFILE environment variable)
+# cacheMemory = the memory limit of the move cache in bytes (or the HARE_HOUNDS_CACHE_MEMORY environment variable in
+# KB, 16 MB by default)
+def main(recordPath=None, board=classicBoard, profileDirectory=None, cacheMemory=None):
+    runTimeBefore = int(round(time.time() * 1000))
+    weights = loadHeuristicWeights()
+    if weights is not None:
+        print("Using the tuned heuristic weights from " + heuristicWeightsFile)
+    else:
+        weights = defaultWeights
+    try:
+        cacheMemory = cacheMemory or cacheMemoryFromEnvironment() or defaultCacheMemory
+        # the record file is checked before the game starts
+        recordWriter = GameRecordWriter(recordPath, board=board) if recordPath else None
+    except ValueError as error:
+        print(error)
+        exit(1)
+
     print("Do you want to play from console or pygame? (0 - console, 1 - pygame): ")
     chosenConsole = False
     console = None
@@ -896,31 +555,100 @@ def main():
     algorithm = chooseAlgorithmRead()  # read what algorithm to use
 
     maxDepth = chooseMaxDepthRead()  # read the difficulty of the game
-    Solve.maxDepth = maxDepth
 
-    choosePlayerRead()  # read the player (JMIN)
+    playerMin = choosePlayerRead()  # read the player (JMIN)
+    playerMax = otherPlayer(playerMin)  # the computer (JMAX)
 
-    table = [[' ', 'c', '*', '*', ' '],
-             ['c', '*', '*', '*', 'i'],
-             [' ', 'c', '*', '*', ' ']]
-    currentTable = Game(table, 0)
+    # the scores of the heuristics and the ends of the game are cached for the search and the end of the game
+    moveCache = MoveCache(cacheMemory)
+    currentTable = initialGame(board, weights, moveCache)
+    table = currentTable.table
 
     print("Initial game table: ")
-    for i in range(3):
-        for j in range(5):
+    for i in range(board.rows):
+        for j in range(board.columns):
             print(table[i][j], end=' ')
         print(end='\n')
 
     # start the game -> hounds moves first
-    currentState = Solve(currentTable, Game.playerSymbols[0], Solve.maxDepth)
-    if console == 0:
-        startPlayingConsole(currentState, algorithm, difficulty)
-    else:
-        startPlayingPyGame(currentState, algorithm, currentTable, difficulty)
+    currentState = Solve(currentTable, Game.playerSymbols[0], maxDepth, playerMax)
+    profileDirectory = profileDirectory or profileDirectoryFromEnvironment()
+    profiler = MoveProfiler(profileDirectory) if profileDirectory else None
+    try:
+        if console == 0:
+            startPlayingConsole(currentState, algorithm, difficulty, runTimeBefore, recordWriter, profiler)
+            runTimeAfter = int(round(time.time() * 1000))
+            print("\n\nTime passed while playing the game: " + str(runTimeAfter - runTimeBefore) + " ms.")
+        else:
+            startPlayingPyGame(currentState, algorithm, currentTable, difficulty, runTimeBefore, recordWriter, profiler)
+    finally:
+        if recordWriter is not None:
+            recordWriter.close()
+        print("Move cache: " + str(moveCache))
+        if profiler is not None:
+            summaryFile = profiler.writeSummary()
+            if summaryFile is not None:
+                print("Profile summary of the game: " + summaryFile)
 
 
 if __name__ == "__main__":
-    runTimeBefore = int(round(time.time() * 1000))
-    main()
-    runTimeAfter = int(round(time.time() * 1000))
-    print("\n\nTime passed while playing the game: " + str(runTimeAfter - runTimeBefore) + " ms.")
+    # --record <file> appends the played game to the game records
+    # --replay <file> checks every game from the game records
+    # --board <rows>x<columns> plays on a bigger board (for example 3x7 or 5x9)
+    # --benchmark [depth] prints the nodes per second of the search on the 3x5, 3x7 and 5x9 boards
+    # (without and with the mirror reduction)
+    # --repetitions [depth] compares the search without and with the repetition detection on positions where the
+    # players can move back and forth
+    # --batch [layers] prints the positions per second of the move generation with the Game objects and batched
+    # --parallel [depth] [processes] prints the time to depth of the parallel search for 1 .. processes processes
+    # (all the cores by default)
+    # --proof [nodes] prints the time of the proof-number search on the known-won positions (and the depth alpha_beta
+    # needs to find the same wins)
+    # --profile <directory> writes the profile of every computer's move and the summary of the game in a new directory
+    # for the game (or set the HARE_HOUNDS_PROFILE environment variable to the directory)
+    # --cache-memory <KB> sets the memory limit of the move cache (or set the HARE_HOUNDS_CACHE_MEMORY environment
+    # variable, in KB)
+    # --regression compares the search with the legacy search on the corpus of positions (the same moves and scores,
+    # also with the move cache, the speedup against the stored baseline) and checks the batched positions, the
+    # proof-number search and the parallel search; --regression-update also saves the results as the new baseline
+    # --tune <games> fits the heuristic weights on <games> self-play games and saves them in heuristicWeightsFile if
+    # they win significantly more games than the current weights at the depths of the games (matchDepths)
+    if len(sys.argv) == 3 and sys.argv[1] == '--tune' and sys.argv[2].isdigit():
+        tuneHeuristicWeights(int(sys.argv[2]))
+    elif len(sys.argv) == 3 and sys.argv[1] == '--replay':
+        try:
+            games, moves = replayGameRecords(sys.argv[2])
+            print("Replayed " + str(games) + " games and " + str(moves) + " moves.")
+        except ValueError as error:
+            print(error)
+            exit(1)
+    elif len(sys.argv) == 3 and sys.argv[1] == '--record':
+        main(sys.argv[2])
+    elif len(sys.argv) == 2 and sys.argv[1] in ['--regression', '--regression-update']:
+        if not runRegression(updateBaseline=sys.argv[1] == '--regression-update'):
+            exit(1)
+    elif len(sys.argv) == 3 and sys.argv[1] == '--profile':
+        main(profileDirectory=sys.argv[2])
+    elif len(sys.argv) == 3 and sys.argv[1] == '--cache-memory' and sys.argv[2].isdigit() and int(sys.argv[2]):
+        main(cacheMemory=int(sys.argv[2]) * 1024)
+    elif len(sys.argv) == 3 and sys.argv[1] == '--board':
+        try:
+            rows, columns = sys.argv[2].split('x')
+            board = Board(int(rows), int(columns))
+        except ValueError as error:
+            print("Invalid board (use <rows>x<columns>, for example 3x7): " + str(error))
+            exit(1)
+        main(board=board)
+    elif len(sys.argv) in [2, 3] and sys.argv[1] == '--benchmark':
+        benchmarkBoards(int(sys.argv[2]) if len(sys.argv) == 3 else 4)
+    elif len(sys.argv) in [2, 3] and sys.argv[1] == '--repetitions':
+        benchmarkRepetitions(int(sys.argv[2]) if len(sys.argv) == 3 else 6)
+    elif len(sys.argv) in [2, 3] and sys.argv[1] == '--batch':
+        benchmarkBatchMoves(int(sys.argv[2]) if len(sys.argv) == 3 else 6)
+    elif len(sys.argv) in [2, 3] and sys.argv[1] == '--proof':
+        benchmarkProofNumber(int(sys.argv[2]) if len(sys.argv) == 3 else 100000)
+    elif len(sys.argv) in [2, 3, 4] and sys.argv[1] == '--parallel':
+        benchmarkParallelSearch(int(sys.argv[2]) if len(sys.argv) >= 3 else 8,
+                                int(sys.argv[3]) if len(sys.argv) == 4 else None)
+    else:
+        main()
@@ -0,0 +1,30 @@
+# Hare and Hounds engine
+# the game (Board, Game), the search algorithms (min_max, alpha_beta, search, parallelSearch, the proof-number
+# search), the game records, the batched positions (BatchGenerator) and the cache of the heuristics (MoveCache); the
+# console and pygame interface is in "Hare and Hounds.py", the regression checks, the legacy search, the benchmarks
+# and the tuning of the heuristics are in hare_hounds_tools (next to it, not installed with the package)
+# there is no global state that changes: the board and the weights are given to every position, and the player of
+# the computer to every search, so more engines can be used at the same time
+from .batch import BatchGenerator, batchHareWins, batchHoundsWin, batchNotFinal, batchWinners
+from .board import Board, allMoves, classicBoard
+from .cache import MoveCache, cacheMemoryEnvironmentVariable, cacheMemoryFromEnvironment, defaultCacheMemory
+from .game import Game, HeuristicWeights, defaultWeights, euclideanDistance, heuristicFeatures, initialGame, \
+    otherPlayer
+from .hashing import ZobristKeys
+from .parallel import SharedTranspositionTable, parallelSearch
+from .profiling import MoveProfiler, profileDirectoryFromEnvironment, profileEnvironmentVariable
+from .proof import ProofNumberSearch, proofNodesPerDepth, proofNumberMove
+from .records import RECORD_MAX_DEPTH, GameRecordReader, GameRecordWriter, decodeMove, encodeMove, recordSettings, \
+    replayGameRecords
+from .search import SearchStopped, Solve, alpha_beta, countSearchedNodes, min_max, repetitionKey, \
+    repetitionsFromHistory, search, uniqueMirroredMoves
+
+__all__ = ['BatchGenerator', 'batchHareWins', 'batchHoundsWin', 'batchNotFinal', 'batchWinners', 'Board', 'allMoves',
+           'classicBoard', 'MoveCache', 'cacheMemoryEnvironmentVariable', 'cacheMemoryFromEnvironment',
+           'defaultCacheMemory', 'Game', 'HeuristicWeights', 'defaultWeights', 'euclideanDistance',
+           'heuristicFeatures', 'initialGame', 'otherPlayer', 'ZobristKeys', 'SharedTranspositionTable',
+           'parallelSearch', 'MoveProfiler', 'profileDirectoryFromEnvironment', 'profileEnvironmentVariable',
+           'ProofNumberSearch', 'proofNodesPerDepth', 'proofNumberMove', 'RECORD_MAX_DEPTH', 'GameRecordReader',
+           'GameRecordWriter', 'decodeMove', 'encodeMove', 'recordSettings', 'replayGameRecords', 'SearchStopped',
+           'Solve', 'alpha_beta', 'countSearchedNodes', 'min_max', 'repetitionKey', 'repetitionsFromHistory', 'search',
+           'uniqueMirroredMoves']
@@ -0,0 +1,194 @@
+import itertools
+
+import numpy as np
+
+from .board import classicBoard
+from .game import Game, defaultWeights, otherPlayer
+
+# the results of BatchGenerator.finalGame (the same as Game.finalGame: False, 'i' or 'c')
+batchNotFinal = 0
+batchHareWins = 1
+batchHoundsWin = 2
+batchWinners = {batchNotFinal: False, batchHareWins: 'i', batchHoundsWin: 'c'}
+
+
+# many positions at once as NumPy arrays (hounds, hare, counter), one element for every position
+# hounds = uint64 bitmask of the cells with a hound (bit k is the position k from the game table)
+# hare = the position of the hare on the game table, counter = the vertical moves of the hounds (houndsVerticalMoves)
+# the moves, the end of the game and the heuristics are calculated for all the positions together and give the same
+# results (and the same order of the moves) as the Game methods
+class BatchGenerator:
+    def __init__(self, board=classicBoard, weights=defaultWeights):
+        if board.cellsNumber > 64:
+            raise ValueError("The batched positions can be used only for boards with at most 64 cells")
+        self.board = board
+        self.weights = weights
+
+        cells = range(board.cellsNumber)
+        self.cellBits = np.array([1 << cell for cell in cells], dtype=np.uint64)
+        self.cellRows = np.array([board.positions[cell][0] for cell in cells], dtype=np.int64)
+        self.cellColumns = np.array([board.positions[cell][1] for cell in cells], dtype=np.int64)
+        # the cells in the order of the table (row by row), the order of the hounds in Game
+        self.tableOrder = sorted(cells, key=lambda cell: board.positions[cell])
+
+        # the moves as (from, to) pairs in the order of Game.generateNextMoves
+        self.hareMoves = [(cell, board.gameTable[rowTo][colTo]) for cell in cells
+                          for rowTo, colTo in board.hareMoves[board.positions[cell][0]][board.positions[cell][1]]]
+        self.houndsMoves = [(cell, board.gameTable[rowTo][colTo]) for cell in self.tableOrder
+                            for rowTo, colTo in board.houndsMoves[board.positions[cell][0]][board.positions[cell][1]]]
+
+        # for every cell of the hare: the cells it can reach and the cells behind it (the hounds there were passed)
+        self.hareNeighbours = np.zeros(board.cellsNumber, dtype=np.uint64)
+        for cellFrom, cellTo in self.hareMoves:
+            self.hareNeighbours[cellFrom] |= self.cellBits[cellTo]
+        self.passedCells = np.array([self.cellBits[self.cellColumns > self.cellColumns[cell]].sum()
+                                     for cell in cells], dtype=np.uint64)
+
+    # the positions of the Game objects as arrays
+    def fromGames(self, games):
+        hounds = np.zeros(len(games), dtype=np.uint64)
+        hare = np.zeros(len(games), dtype=np.int64)
+        counter = np.zeros(len(games), dtype=np.int64)
+        for index, game in enumerate(games):
+            for cell, (row, column) in enumerate(self.board.positions):
+                if game.table[row][column] == 'c':
+                    hounds[index] |= self.cellBits[cell]
+                elif game.table[row][column] == 'i':
+                    hare[index] = cell
+            counter[index] = game.houndsVerticalMoves
+        return hounds, hare, counter
+
+    # the Game objects of the positions
+    def toGames(self, positions):
+        games = []
+        for hounds, hare, counter in zip(*positions):
+            table = self.board.initialTable()
+            for cell, (row, column) in enumerate(self.board.positions):
+                if hounds & self.cellBits[cell]:
+                    table[row][column] = 'c'
+                elif cell == hare:
+                    table[row][column] = 'i'
+                else:
+                    table[row][column] = Game.gameGoal
+            games.append(Game(table, int(counter), self.board, self.weights))
+        return games
+
+    # all the next positions of the current player from all the positions
+    # returns the next positions (hounds, hare, counter) and, for every one of them, the index of the position it
+    # comes from; the next positions of a position are together and in the order of Game.generateNextMoves
+    def generateNextMoves(self, positions, currentPlayer):
+        hounds, hare, counter = positions
+        occupied = hounds | self.cellBits[hare]
+        nextPositions = []
+        for order, (cellFrom, cellTo) in enumerate(self.hareMoves if currentPlayer == 'i' else self.houndsMoves):
+            if currentPlayer == 'i':
+                moving = (hare == cellFrom) & (occupied & self.cellBits[cellTo] == 0)
+            else:
+                moving = (hounds & self.cellBits[cellFrom] != 0) & (occupied & self.cellBits[cellTo] == 0)
+            parents = np.nonzero(moving)[0]
+            if not len(parents):
+                continue
+
+            if currentPlayer == 'i':
+                nextHounds = hounds[parents]
+                nextHare = np.full(len(parents), cellTo, dtype=np.int64)
+                nextCounter = counter[parents]
+            else:
+                nextHounds = hounds[parents] ^ (self.cellBits[cellFrom] | self.cellBits[cellTo])
+                nextHare = hare[parents]
+                if self.cellColumns[cellFrom] == self.cellColumns[cellTo]:  # a vertical move
+                    nextCounter = counter[parents] + 1
+                else:
+                    nextCounter = np.zeros(len(parents), dtype=np.int64)
+            nextPositions.append((nextHounds, nextHare, nextCounter, parents, np.full(len(parents), order)))
+
+        if not nextPositions:
+            return (np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)), \
+                np.zeros(0, dtype=np.int64)
+        nextHounds, nextHare, nextCounter, parents, orders = (np.concatenate(arrays) for arrays in zip(*nextPositions))
+        sortedMoves = np.lexsort((orders, parents))
+        return (nextHounds[sortedMoves], nextHare[sortedMoves], nextCounter[sortedMoves]), parents[sortedMoves]
+
+    # the end of the game for all the positions: batchNotFinal, batchHareWins or batchHoundsWin
+    def finalGame(self, positions):
+        hounds, hare, counter = positions
+        final = np.full(len(hare), batchNotFinal, dtype=np.int8)
+        # the hare is surrounded
+        final[self.hareNeighbours[hare] & ~hounds == 0] = batchHoundsWin
+        # all the hounds were passed by the hare or the hounds moved only vertically
+        final[(hounds & self.passedCells[hare] == hounds) | (counter >= 10)] = batchHareWins
+        return final
+
+    # the rows and the columns of the hounds (in the order of the table, as in Game) and of the hare
+    def piecesCoordinates(self, positions):
+        hounds, hare, counter = positions
+        houndsRows = np.zeros((len(hare), self.board.houndsNumber), dtype=np.int64)
+        houndsColumns = np.zeros((len(hare), self.board.houndsNumber), dtype=np.int64)
+        houndsFound = np.zeros(len(hare), dtype=np.int64)
+        for cell in self.tableOrder:
+            found = np.nonzero(hounds & self.cellBits[cell] != 0)[0]
+            houndsRows[found, houndsFound[found]] = self.cellRows[cell]
+            houndsColumns[found, houndsFound[found]] = self.cellColumns[cell]
+            houndsFound[found] += 1
+        return houndsRows, houndsColumns, self.cellRows[hare], self.cellColumns[hare]
+
+    # Game.weightedScore for all the positions (the operations are done in the same order, hound by hound)
+    def weightedScore(self, coordinates, currentPlayer, distance, weights):
+        houndsRows, houndsColumns, hareRow, hareColumn = coordinates
+        distanceHounds = [distance(houndsRows[:, hound] - hareRow, houndsColumns[:, hound] - hareColumn)
+                          for hound in range(self.board.houndsNumber)]
+
+        score = np.zeros(len(hareRow))
+        if currentPlayer == 'i':
+            for hound, distanceHound in enumerate(distanceHounds):
+                score = score + np.where(hareColumn > houndsColumns[:, hound],
+                                         weights['hareDistance'] * distanceHound - weights['houndsInFront'],
+                                         np.where(hareColumn == houndsColumns[:, hound],
+                                                  weights['hareDistance'] * distanceHound, weights['houndsPassed']))
+        else:
+            distanceSum = np.zeros(len(hareRow))
+            for distanceHound in distanceHounds:
+                distanceSum = distanceSum + distanceHound
+            score = weights['houndsDistance'] * distanceSum / self.board.houndsNumber
+            if weights['houndsSpread']:
+                spread = np.zeros(len(hareRow))
+                for hound1, hound2 in itertools.combinations(range(self.board.houndsNumber), 2):
+                    spread = spread + distance(houndsRows[:, hound1] - houndsRows[:, hound2],
+                                               houndsColumns[:, hound1] - houndsColumns[:, hound2])
+                score = score - weights['houndsSpread'] * spread
+        return score
+
+    # Game.heuristicCalculation (manhattan distance) for all the positions
+    def heuristicCalculation(self, positions, playerMax, coordinates=None):
+        coordinates = coordinates or self.piecesCoordinates(positions)
+        weights = self.weights.heuristicWeights
+        return self.weightedScore(coordinates, playerMax, manhattanDistances, weights) - \
+            self.weightedScore(coordinates, otherPlayer(playerMax), manhattanDistances, weights)
+
+    # Game.heuristicCalculation2 (euclidean distance) for all the positions
+    def heuristicCalculation2(self, positions, playerMax, coordinates=None):
+        coordinates = coordinates or self.piecesCoordinates(positions)
+        weights = self.weights.heuristicWeights2
+        return self.weightedScore(coordinates, playerMax, euclideanDistances, weights) - \
+            self.weightedScore(coordinates, otherPlayer(playerMax), euclideanDistances, weights)
+
+    # Game.scoreEstimation for all the positions
+    def scoreEstimation(self, positions, depth, difficulty, playerMax):
+        final = self.finalGame(positions)
+        if 1 <= difficulty <= self.weights.difficultySplit:
+            score = self.heuristicCalculation2(positions, playerMax)
+        else:
+            score = self.heuristicCalculation(positions, playerMax)
+        playerMaxWins = batchHareWins if playerMax == 'i' else batchHoundsWin
+        score[final == playerMaxWins] = 999 + depth
+        score[(final != batchNotFinal) & (final != playerMaxWins)] = -999 - depth
+        return score
+
+
+# the distances between the cells for all the positions (rows and columns = the differences between the cells)
+def manhattanDistances(rows, columns):
+    return np.abs(rows) + np.abs(columns)
+
+
+def euclideanDistances(rows, columns):
+    return np.sqrt(rows ** 2 + columns ** 2)
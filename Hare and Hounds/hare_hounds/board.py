@@ -0,0 +1,93 @@
+# returns all possible moves; 8 directions
+def allMoves(row, column):
+    # top
+    topMove = [row - 1, column]
+    # top-right
+    topRightMove = [row - 1, column + 1]
+    # right
+    rightMove = [row, column + 1]
+    # bottom-right
+    bottomRightMove = [row + 1, column + 1]
+    # bottom
+    bottomMove = [row + 1, column]
+    # bottom-left
+    bottomLeftMove = [row + 1, column - 1]
+    # left
+    leftMove = [row, column - 1]
+    # top-left
+    topLeftMove = [row - 1, column - 1]
+
+    return [topMove, topRightMove, rightMove, bottomRightMove, bottomMove, bottomLeftMove, leftMove, topLeftMove]
+
+
+# the definition of the game board
+# the classic board is 3 x 5: the first and the last column have only the middle cell
+# the cells are connected horizontally and vertically; diagonally only the cells where (row - middle row + column) is even
+# the hounds start on the first two columns and the hare on the last column
+class Board:
+    def __init__(self, rows=3, columns=5):
+        if rows < 3 or columns < 3 or rows % 2 == 0 or columns % 2 == 0:
+            raise ValueError("The board needs an odd number of rows and columns (at least 3 x 3)")
+        self.rows = rows
+        self.columns = columns
+        self.middleRow = rows // 2
+
+        # the edges from the matrix where is an empty space
+        self.impossibleMoves = [[row, column] for column in [0, columns - 1] for row in range(rows)
+                                if row != self.middleRow]
+
+        # the game table: the positions of the cells (the numbers used to choose a position), column by column
+        self.gameTable = [[' '] * columns for _ in range(rows)]
+        self.positions = []  # the (row, column) of every position from the game table
+        for column in range(columns):
+            for row in range(rows):
+                if [row, column] not in self.impossibleMoves:
+                    self.gameTable[row][column] = len(self.positions)
+                    self.positions.append((row, column))
+        self.cellsNumber = len(self.positions)
+
+        # the moves from every cell, calculated only once for the whole game
+        # hareMoves[row][column] -> all the cells the hare can reach; houndsMoves -> the ones the hounds can reach
+        # (the hounds can not go backwards)
+        # houndsInvalidMoves / hareInvalidMovements -> the diagonals (from) -> (to) that are not connected
+        self.hareMoves = [[[] for _ in range(columns)] for _ in range(rows)]
+        self.houndsMoves = [[[] for _ in range(columns)] for _ in range(rows)]
+        self.houndsInvalidMoves = []
+        self.hareInvalidMovements = []
+        for rowFrom, colFrom in self.positions:
+            for rowTo, colTo in allMoves(rowFrom, colFrom):
+                if not self.withinBounds(rowTo, colTo) or [rowTo, colTo] in self.impossibleMoves:
+                    continue
+                if rowFrom != rowTo and colFrom != colTo and (rowFrom - self.middleRow + colFrom) % 2 == 1:
+                    self.hareInvalidMovements.append([(rowFrom, colFrom), (rowTo, colTo)])
+                    if colTo > colFrom:
+                        self.houndsInvalidMoves.append([(rowFrom, colFrom), (rowTo, colTo)])
+                    continue
+                self.hareMoves[rowFrom][colFrom].append([rowTo, colTo])
+                if colTo >= colFrom:
+                    self.houndsMoves[rowFrom][colFrom].append([rowTo, colTo])
+
+        self.houndsStart = [[self.middleRow, 0]] + [[row, 1] for row in range(rows) if row != self.middleRow]
+        self.houndsNumber = len(self.houndsStart)
+        self.hareStart = [self.middleRow, columns - 1]
+
+    def __str__(self):
+        return str(self.rows) + "x" + str(self.columns)
+
+    def withinBounds(self, positionX, positionY):
+        if 0 <= positionX < self.rows and 0 <= positionY < self.columns:
+            return True
+        return False
+
+    # the table at the start of the game ('*' is the empty space, Game.gameGoal)
+    def initialTable(self):
+        table = [[' ' if [row, column] in self.impossibleMoves else '*' for column in range(self.columns)]
+                 for row in range(self.rows)]
+        for [row, column] in self.houndsStart:
+            table[row][column] = 'c'
+        table[self.hareStart[0]][self.hareStart[1]] = 'i'
+        return table
+
+
+# the classic board of the game (3 x 5, 3 hounds); the boards are not changed after they are created
+classicBoard = Board(3, 5)
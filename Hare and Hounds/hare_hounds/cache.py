@@ -0,0 +1,98 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+# the environment variable with the memory limit of the move cache of the game (in KB)
+cacheMemoryEnvironmentVariable = 'HARE_HOUNDS_CACHE_MEMORY'
+defaultCacheMemory = 16 * 1024 * 1024
+
+
+# the scores of the heuristics (for every table, player and heuristic) and the end of the game (for every table) of
+# the positions already seen; the least recently used entries are removed when the memory of the entries (estimated
+# with sys.getsizeof) is over memoryLimit bytes; one lock protects the entries and the counters, so more threads can
+# use the same cache
+# the key is the table joined in one string: the heuristics (weightedScore with the scipy distances) take most of
+# the time of a search, while the legal moves are found faster than the key is built, so they are not kept
+class MoveCache:
+    def __init__(self, memoryLimit=defaultCacheMemory):
+        self.memoryLimit = memoryLimit
+        self.entries = OrderedDict()  # key -> (value, size)
+        self.memoryUsed = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    # another process gets an empty cache (the entries and the lock are not sent)
+    def __getstate__(self):
+        return {'memoryLimit': self.memoryLimit}
+
+    def __setstate__(self, state):
+        self.__init__(state['memoryLimit'])
+
+    # the value of key from the cache or from calculate() (the values must not be changed by the callers)
+    def cachedValue(self, key, calculate):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        value = calculate()
+        size = entrySize(key, value)
+        with self.lock:
+            if key not in self.entries and size <= self.memoryLimit:
+                self.entries[key] = value, size
+                self.memoryUsed += size
+                while self.memoryUsed > self.memoryLimit:
+                    oldValue, oldSize = self.entries.popitem(last=False)[1]
+                    self.memoryUsed -= oldSize
+                    self.evictions += 1
+        return value
+
+    # easier = heuristicCalculation2 (the easier difficulties), otherwise heuristicCalculation
+    def heuristicScore(self, position, playerMax, easier):
+        key = ''.join(map(''.join, position.table)), playerMax, easier
+        if easier:
+            return self.cachedValue(key, lambda: position.heuristicCalculation2(playerMax))
+        return self.cachedValue(key, lambda: position.heuristicCalculation(playerMax))
+
+    def finalGame(self, position):
+        return self.cachedValue(''.join(map(''.join, position.table)), position.tableFinalGame)
+
+    def hitRate(self):
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.memoryUsed = 0
+
+    def __str__(self):
+        return "{} hits, {} misses ({:.1%} hit rate), {} entries, {:.1f} KB of {:.1f} KB, {} evictions".format(
+            self.hits, self.misses, self.hitRate(), len(self.entries), self.memoryUsed / 1024,
+            self.memoryLimit / 1024, self.evictions)
+
+
+# the memory limit of the move cache in bytes from the environment variable or None if it is not set
+def cacheMemoryFromEnvironment():
+    value = os.environ.get(cacheMemoryEnvironmentVariable)
+    if not value:
+        return None
+    if not value.isdigit() or int(value) == 0:
+        raise ValueError("{} must be a positive number of KB, not {}".format(cacheMemoryEnvironmentVariable, value))
+    return int(value) * 1024
+
+
+# the estimated memory of an entry of the cache (the key, the value and the tuples inside them)
+def entrySize(key, value):
+    size = 0
+    for item in [key, value]:
+        size += sys.getsizeof(item)
+        if isinstance(item, tuple):
+            size += sum(sys.getsizeof(element) for element in item)
+    return size
@@ -0,0 +1,348 @@
+import itertools
+from cmath import sqrt
+
+from scipy.spatial.distance import cityblock
+
+from .board import classicBoard
+
+
+# euclidean distance between two positions [row, column]
+def euclideanDistance(position1, position2):
+    return (sqrt((position1[0] - position2[0]) ** 2 + (position1[1] - position2[1]) ** 2)).real
+
+
+# the other player ('c' <-> 'i')
+def otherPlayer(currentPlayer):
+    return 'i' if currentPlayer == 'c' else 'c'
+
+
+# the features of a position used by the heuristics (see Game.scoreFeatures)
+heuristicFeatures = ['hareDistance', 'houndsInFront', 'houndsPassed', 'houndsDistance', 'houndsSpread']
+
+
+# the weights of the heuristics
+# heuristicWeights - manhattan distance (heuristicCalculation), heuristicWeights2 - euclidean distance
+# (heuristicCalculation2); difficulty <= difficultySplit uses heuristicCalculation2, otherwise heuristicCalculation
+class HeuristicWeights:
+    def __init__(self, heuristicWeights=None, heuristicWeights2=None, difficultySplit=6):
+        # the default values are the hand-picked ones
+        self.heuristicWeights = {'hareDistance': 1, 'houndsInFront': 1, 'houndsPassed': 5,
+                                 'houndsDistance': 1, 'houndsSpread': 1}
+        self.heuristicWeights2 = {'hareDistance': 1, 'houndsInFront': 1, 'houndsPassed': 5,
+                                  'houndsDistance': 1, 'houndsSpread': 0}
+        self.heuristicWeights.update(heuristicWeights or {})
+        self.heuristicWeights2.update(heuristicWeights2 or {})
+        self.difficultySplit = difficultySplit
+
+
+# the hand-picked weights; the weights are not changed after they are created
+defaultWeights = HeuristicWeights()
+
+
+class Game:
+    # player symbols
+    playerSymbols = ['c', 'i']
+
+    # the empty space on the matrix
+    gameGoal = '*'
+
+    # the board and the weights of the heuristics are shared by all the positions of a game
+    # moveCache = MoveCache for the heuristics and the end of the game (None - no cache), given to the next positions
+    def __init__(self, table, houndsVerticalMoves, board=classicBoard, weights=defaultWeights, moveCache=None):
+        self.table = table  # current table during the game
+        self.houndsVerticalMoves = houndsVerticalMoves
+        self.board = board
+        self.weights = weights
+        self.moveCache = moveCache
+
+    # finding the position of a hare on the table
+    # symbol is a string of 'c' or 'i'
+    def findSymbolPosition(self, symbol):
+        for i in range(self.board.rows):
+            for j in range(self.board.columns):
+                if self.table[i][j] == symbol:
+                    return i, j
+        return -1, -1
+
+    def getPositionFromGameTable(self, position):
+        if position in range(self.board.cellsNumber):
+            return self.board.positions[position]
+        return -1, -1
+
+    # given coordinates where to go, check if from the current position, you can reach the given destination
+    # function used for checking the user's input
+    def checkIfYouCanGo(self, currentPlayer, rowDestinationToReach, columnDestinationToReach,
+                        rowHoundFrom=None,
+                        columnHoundFrom=None):  # used when a hound moves so whe know which one to move
+        if currentPlayer == 'i':
+            rowFrom, colFrom = self.findSymbolPosition('i')
+            # if the move from the current position to the destination (from input) is reachable
+            if self.legalMove(currentPlayer, rowFrom, colFrom, rowDestinationToReach, columnDestinationToReach):
+                return True
+        else:
+            # if the move from the current position to the destination (from input) is reachable
+            if self.legalMove(currentPlayer, rowHoundFrom, columnHoundFrom, rowDestinationToReach,
+                              columnDestinationToReach):
+                return True
+
+        return False
+
+    # function to check if the current player movement is valid from their current position to given coordinates
+    # the valid movements are calculated by the board (the hounds can not move behind their current position and
+    # the hare can move in any direction, but only between connected positions)
+    def legalMove(self, currentPlayer, rowFrom, colFrom, rowTo, colTo):
+        if not self.board.withinBounds(rowFrom, colFrom):
+            return False
+
+        if currentPlayer == 'c':
+            return [rowTo, colTo] in self.board.houndsMoves[rowFrom][colFrom]
+        return [rowTo, colTo] in self.board.hareMoves[rowFrom][colFrom]
+
+    # the key of the position (the table and the number of vertical moves of the hounds), used for hashing
+    def positionKey(self):
+        return ''.join(''.join(row) for row in self.table), self.houndsVerticalMoves
+
+    # the key of the table only (the same for the table and its mirror), used for finding the repetitions
+    # (see Solve.repetitions)
+    def tableKey(self):
+        key = ''.join(''.join(row) for row in self.table)
+        return min(key, ''.join(''.join(row) for row in reversed(self.table)))
+
+    # the key of the position reflected over the middle row (row 0 <-> the last row)
+    # the board and the moves are symmetric, so the mirrored position is the same game
+    def mirrorKey(self):
+        return ''.join(''.join(row) for row in reversed(self.table)), self.houndsVerticalMoves
+
+    # the same key for a position and its mirror (the smallest one) and if the position is the mirrored one
+    # this key should be used by every table that stores positions
+    def canonicalKey(self):
+        key = self.positionKey()
+        mirroredKey = self.mirrorKey()
+        if mirroredKey < key:
+            return mirroredKey, True
+        return key, False
+
+    def isSymmetric(self):
+        return self.positionKey() == self.mirrorKey()
+
+    # moves the current player on the table from (rowFrom, colFrom) to (rowTo, colTo)
+    # the same state update is used by the console, pygame and the replay of the game records
+    def makeMove(self, currentPlayer, rowFrom, colFrom, rowTo, colTo):
+        self.table[rowFrom][colFrom] = self.gameGoal
+        self.table[rowTo][colTo] = currentPlayer
+
+        if currentPlayer == 'c':
+            # count how many times the hound moved vertically
+            if colFrom == colTo:
+                self.houndsVerticalMoves += 1
+            else:
+                self.houndsVerticalMoves = 0
+
+    def copy(self):
+        return Game([row.copy() for row in self.table], self.houndsVerticalMoves, self.board, self.weights,
+                    self.moveCache)
+
+    # the position after the current player moves from positionFrom to positionTo (positions from the game table)
+    # the current position is not changed
+    def playMove(self, currentPlayer, positionFrom, positionTo):
+        rowFrom, colFrom = self.getPositionFromGameTable(positionFrom)
+        rowTo, colTo = self.getPositionFromGameTable(positionTo)
+        if self.table[rowFrom][colFrom] != currentPlayer or self.table[rowTo][colTo] != self.gameGoal or \
+                not self.legalMove(currentPlayer, rowFrom, colFrom, rowTo, colTo):
+            raise ValueError("Invalid move {} -> {} for {}".format(positionFrom, positionTo, currentPlayer))
+        nextGame = self.copy()
+        nextGame.makeMove(currentPlayer, rowFrom, colFrom, rowTo, colTo)
+        return nextGame
+
+    # finds the move of the current player between this table and the next one (after the move)
+    # returns the positions from the game table of the cell left and of the cell reached
+    def findMoveTo(self, nextGame, currentPlayer):
+        positionFrom = positionTo = -1
+        for i in range(self.board.rows):
+            for j in range(self.board.columns):
+                if self.table[i][j] == currentPlayer and nextGame.table[i][j] == self.gameGoal:
+                    positionFrom = self.board.gameTable[i][j]
+                elif self.table[i][j] == self.gameGoal and nextGame.table[i][j] == currentPlayer:
+                    positionTo = self.board.gameTable[i][j]
+        return positionFrom, positionTo
+
+    # the moves of the current player as (rowFrom, colFrom, rowTo, colTo), in the order of generateNextMoves
+    def legalMoves(self, currentPlayer):
+        return self.findLegalMoves(currentPlayer)
+
+    # the moves from every cell are taken from the board, so only the empty destinations are checked here
+    def findLegalMoves(self, currentPlayer):
+        movesList = []
+
+        if currentPlayer == 'i':  # hare
+            rowFrom, colFrom = self.findSymbolPosition(currentPlayer)
+            if rowFrom != -1 and colFrom != -1:
+                for [rowTo, colTo] in self.board.hareMoves[rowFrom][colFrom]:
+                    if self.table[rowTo][colTo] == Game.gameGoal:
+                        movesList.append((rowFrom, colFrom, rowTo, colTo))
+
+        if currentPlayer == 'c':
+            for i in range(self.board.rows):  # finding the positions of the all hounds
+                for j in range(self.board.columns):
+                    if self.table[i][j] == 'c':
+                        for [rowTo, colTo] in self.board.houndsMoves[i][j]:
+                            if self.table[rowTo][colTo] == Game.gameGoal:
+                                movesList.append((i, j, rowTo, colTo))
+
+        return tuple(movesList)
+
+    # function to generate the next moves from the current position of the current player
+    def generateNextMoves(self, currentPlayer):
+        movesList = []
+        for rowFrom, colFrom, rowTo, colTo in self.legalMoves(currentPlayer):
+            # creating a new table game with current settings
+            newTableGame = [row.copy() for row in self.table]
+            # setting current position to empty space
+            newTableGame[rowFrom][colFrom] = self.gameGoal
+            # moving the position of the player
+            newTableGame[rowTo][colTo] = currentPlayer
+            houndsVerticalMoves = self.houndsVerticalMoves
+            if currentPlayer == 'c':
+                # if they move vertically all the time
+                houndsVerticalMoves = houndsVerticalMoves + 1 if colFrom == colTo else 0
+            movesList.append(Game(newTableGame, houndsVerticalMoves, self.board, self.weights, self.moveCache))
+
+        return movesList
+
+    def finalGame(self):
+        if self.houndsVerticalMoves >= 10:
+            return 'i'
+        if self.moveCache is not None:
+            return self.moveCache.finalGame(self)
+        return self.tableFinalGame()
+
+    # the end of the game given by the table only (without the vertical moves of the hounds)
+    def tableFinalGame(self):
+        rowFrom, colFrom = self.findSymbolPosition('i')
+        # if all hounds are after the hare, then the hare wins
+        houndsNumber = 0
+        if rowFrom != -1 and colFrom != -1:
+            for i in range(self.board.rows):
+                for j in range(colFrom + 1, self.board.columns):
+                    if self.table[i][j] == 'c':
+                        houndsNumber += 1
+
+        if houndsNumber == self.board.houndsNumber:
+            return 'i'
+
+        # find if the hare is surrounded by hounds, then the hounds can still win
+        ok = 0
+        if rowFrom != -1 and colFrom != -1:
+            for [rowTo, colTo] in self.board.hareMoves[rowFrom][colFrom]:
+                # find if there is a valid move to a empty place to move for hare so it is not game over for her
+                if self.table[rowTo][colTo] == self.gameGoal:
+                    ok = 1
+                    break
+        if ok == 0:
+            return 'c'
+
+        return False  # the game is not finished yet
+
+    # the values used by the heuristics for every position (the weights are multiplied with them)
+    # hareDistance - the distance from the hare to the hounds that did not pass it yet
+    # houndsInFront - how many hounds are still in front of the hare
+    # houndsPassed - how many hounds were passed by the hare
+    # houndsDistance - the mean distance between the hounds and the hare
+    # houndsSpread - how far apart are the hounds
+    def scoreFeatures(self, distance):
+        rowFromHare, colFromHare = self.findSymbolPosition('i')
+        harePosition = [rowFromHare, colFromHare]
+        houndsPositions = []
+        for i in range(self.board.rows):
+            for j in range(self.board.columns):
+                if self.table[i][j] == 'c':
+                    houndsPositions.append([i, j])
+
+        distanceHounds = [distance(houndPosition, harePosition) for houndPosition in houndsPositions]
+
+        features = dict.fromkeys(heuristicFeatures, 0)
+        for houndPosition, distanceHound in zip(houndsPositions, distanceHounds):
+            if colFromHare > houndPosition[1]:
+                features['hareDistance'] += distanceHound
+                features['houndsInFront'] += 1
+            elif colFromHare == houndPosition[1]:
+                features['hareDistance'] += distanceHound
+            else:
+                features['houndsPassed'] += 1
+
+        features['houndsDistance'] = sum(distanceHounds) / len(houndsPositions)
+        features['houndsSpread'] = sum(distance(houndPosition1, houndPosition2)
+                                       for houndPosition1, houndPosition2 in itertools.combinations(houndsPositions, 2))
+        return features
+
+    # the score of the current player with the weights of the heuristic
+    # it is the same as the features of the position multiplied with the weights, but calculated hound by hound
+    # (the same order of the operations as the hand-picked heuristics, so the scores are exactly the same)
+    def weightedScore(self, currentPlayer, distance, weights):
+        rowFromHare, colFromHare = self.findSymbolPosition('i')
+        harePosition = [rowFromHare, colFromHare]
+        houndsPositions = []
+        for i in range(self.board.rows):
+            for j in range(self.board.columns):
+                if self.table[i][j] == 'c':
+                    houndsPositions.append([i, j])
+
+        distanceHounds = [distance(houndPosition, harePosition) for houndPosition in houndsPositions]
+
+        if currentPlayer == 'i':
+            score = 0
+            for houndPosition, distanceHound in zip(houndsPositions, distanceHounds):
+                if colFromHare > houndPosition[1]:
+                    score += weights['hareDistance'] * distanceHound - weights['houndsInFront']
+                elif colFromHare == houndPosition[1]:
+                    score += weights['hareDistance'] * distanceHound
+                else:
+                    score += weights['houndsPassed']  # bonus points if he passes a hound
+        else:
+            # calculating the mean distance between the hounds and the hare
+            score = weights['houndsDistance'] * sum(distanceHounds) / len(houndsPositions)
+            if weights['houndsSpread']:
+                # grouping them together => dropping useless states that can lose the game
+                score -= weights['houndsSpread'] * sum(
+                    distance(houndPosition1, houndPosition2)
+                    for houndPosition1, houndPosition2 in itertools.combinations(houndsPositions, 2))
+        return score
+
+    # score estimation using euclidean distance
+    # it is used for a easier game
+    def scoreCalculation2(self, currentPlayer):
+        return self.weightedScore(currentPlayer, euclideanDistance, self.weights.heuristicWeights2)
+
+    # score estimation using manhattan distance (a bit better because it is a grid style)
+    # it is used for a harder game
+    def scoreCalculation(self, currentPlayer):
+        return self.weightedScore(currentPlayer, cityblock, self.weights.heuristicWeights)
+
+    # a harder game (7-10 difficulty)
+    # playerMax = the player of the computer (the score is calculated for him)
+    def heuristicCalculation(self, playerMax):
+        return self.scoreCalculation(playerMax) - self.scoreCalculation(otherPlayer(playerMax))
+
+    # a bit easier game (1-6 difficulty)
+    def heuristicCalculation2(self, playerMax):
+        return self.scoreCalculation2(playerMax) - self.scoreCalculation2(otherPlayer(playerMax))
+
+    def scoreEstimation(self, depth, difficulty, playerMax):
+        t_final = self.finalGame()
+        if t_final == playerMax:
+            return 999 + depth
+        elif t_final == otherPlayer(playerMax):
+            return -999 - depth
+        else:
+            easier = 1 <= difficulty <= self.weights.difficultySplit
+            if self.moveCache is not None:
+                return self.moveCache.heuristicScore(self, playerMax, easier)
+            if easier:
+                return self.heuristicCalculation2(playerMax)
+            else:
+                return self.heuristicCalculation(playerMax)
+
+
+# the position at the start of the game
+def initialGame(board=classicBoard, weights=defaultWeights, moveCache=None):
+    return Game(board.initialTable(), 0, board, weights, moveCache)
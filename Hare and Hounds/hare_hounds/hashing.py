@@ -0,0 +1,46 @@
+import random
+
+
+# the random keys of the cells (Zobrist hashing), of the vertical moves of the hounds and of the player to move
+# the keys are the same in every process (the same seed)
+# the hashes of a position are (the hash of the table, the hash of its mirror); positionHash returns the canonical key
+# (the smallest one of the two) and if the table is the mirrored one, the same as Game.canonicalKey
+class ZobristKeys:
+    def __init__(self, board):
+        generator = random.Random(board.rows * 1000 + board.columns)
+        self.hounds = [[generator.getrandbits(64) for _ in range(board.columns)] for _ in range(board.rows)]
+        self.hare = [[generator.getrandbits(64) for _ in range(board.columns)] for _ in range(board.rows)]
+        self.verticalMoves = [generator.getrandbits(64) for _ in range(11)]  # 10 or more ends the game
+        self.playerToMove = {'c': generator.getrandbits(64), 'i': generator.getrandbits(64)}
+        self.lastRow = board.rows - 1
+
+    def positionHashes(self, position, currentPlayer):
+        key = self.verticalMoves[min(position.houndsVerticalMoves, 10)] ^ self.playerToMove[currentPlayer]
+        mirroredKey = key
+        for i, row in enumerate(position.table):
+            for j, symbol in enumerate(row):
+                if symbol == 'c':
+                    key ^= self.hounds[i][j]
+                    mirroredKey ^= self.hounds[self.lastRow - i][j]
+                elif symbol == 'i':
+                    key ^= self.hare[i][j]
+                    mirroredKey ^= self.hare[self.lastRow - i][j]
+        return key, mirroredKey
+
+    def positionHash(self, position, currentPlayer):
+        key, mirroredKey = self.positionHashes(position, currentPlayer)
+        if mirroredKey < key:
+            return mirroredKey, True
+        return key, False
+
+    # the hashes of nextPosition, reached with the move (rowFrom, colFrom, rowTo, colTo) of currentPlayer from a
+    # position with the given hashes, without looking at the table
+    def moveHashes(self, hashes, position, nextPosition, currentPlayer, move):
+        rowFrom, colFrom, rowTo, colTo = move
+        cells = self.hounds if currentPlayer == 'c' else self.hare
+        change = self.verticalMoves[min(position.houndsVerticalMoves, 10)] ^ \
+            self.verticalMoves[min(nextPosition.houndsVerticalMoves, 10)] ^ \
+            self.playerToMove['c'] ^ self.playerToMove['i']
+        key, mirroredKey = hashes
+        return key ^ change ^ cells[rowFrom][colFrom] ^ cells[rowTo][colTo], \
+            mirroredKey ^ change ^ cells[self.lastRow - rowFrom][colFrom] ^ cells[self.lastRow - rowTo][colTo]
@@ -0,0 +1,289 @@
+import multiprocessing
+import os
+import queue
+import random
+import struct
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .hashing import ZobristKeys
+from .search import SearchStopped, Solve, repetitionsFromHistory, search
+
+# Lazy SMP: more processes search the same position with iterative deepening, with different orders of the moves
+# (and half of them one depth ahead), and share what they found through one transposition table
+# the table is in shared memory and has no locks: every entry is (check, score, info) with
+# check = key ^ score ^ info, so an entry written by two processes at the same time is not matching any key
+# a position and its mirror share one entry (the same as Game.canonicalKey): the key is the smallest hash of the two
+# tables and the best move is stored for the table with that hash (moveKey)
+tableEntryWords = 3
+tableExact = 0
+tableLowerBound = 1  # the score is at least the stored one (beta cut)
+tableUpperBound = 2  # the score is at most the stored one (no move was better than alpha)
+
+# the control words after the entries of the table: stop the helpers, the deepest completed depth
+controlStop = 0
+controlCompletedDepth = 1
+controlWords = 2
+# the time the helpers have to stop (all together) after the search ends, before they are terminated; it is kept
+# from the time budget, so the search ends inside it
+helperStopTime = 0.05
+
+
+# the move of currentPlayer between position and nextPosition as one number (cell from * cells + cell to), for the
+# mirrored table when mirrored is True, so the same move is found from a position and from its mirror
+def moveKey(position, nextPosition, currentPlayer, mirrored):
+    board = position.board
+    cellFrom = cellTo = 0
+    for i in range(board.rows):
+        row = board.rows - 1 - i if mirrored else i
+        for j in range(board.columns):
+            if position.table[i][j] == currentPlayer and nextPosition.table[i][j] == position.gameGoal:
+                cellFrom = row * board.columns + j
+            elif position.table[i][j] == position.gameGoal and nextPosition.table[i][j] == currentPlayer:
+                cellTo = row * board.columns + j
+    return cellFrom * board.rows * board.columns + cellTo
+
+
+# the transposition table over a shared memory block (created by the main process, used by all the helpers)
+class SharedTranspositionTable:
+    def __init__(self, sharedMemory, entriesNumber):
+        self.entriesNumber = entriesNumber
+        words = np.ndarray((entriesNumber * tableEntryWords + controlWords,), dtype=np.uint64,
+                           buffer=sharedMemory.buf)
+        self.entries = words[:entriesNumber * tableEntryWords].reshape(entriesNumber, tableEntryWords)
+        self.control = words[entriesNumber * tableEntryWords:]
+
+    @staticmethod
+    def memorySize(entriesNumber):
+        return (entriesNumber * tableEntryWords + controlWords) * 8
+
+    # (score, depth, flag, moveKey of the best move) or None if the position is not in the table
+    def probe(self, key):
+        check, scoreBits, info = self.entries[key % self.entriesNumber].tolist()
+        if check ^ scoreBits ^ info != key:
+            return None
+        return struct.unpack('<d', struct.pack('<Q', scoreBits))[0], info & 0xff, (info >> 8) & 0x3, info >> 10
+
+    def store(self, key, score, depth, flag, bestMove):
+        scoreBits = struct.unpack('<Q', struct.pack('<d', score))[0]
+        info = depth | flag << 8 | bestMove << 10
+        self.entries[key % self.entriesNumber] = (key ^ scoreBits ^ info, scoreBits, info)
+
+
+# one process of the Lazy SMP search: alpha beta (the same as search.alpha_beta) with the transposition table
+# the score of an entry is used only for the same depth: the score of a deeper search is not the score alpha_beta
+# finds at this depth, so the result would depend on what the other helpers stored; deeper entries only give the
+# first move to search
+# the score of a repeated table (Solve.repeated) depends on the line that reached it, so the positions searched
+# below a repeated table are not stored (repeatedLeaves counts the repeated tables found)
+class LazySearchHelper:
+    def __init__(self, helperIndex, table, zobristKeys, difficulty, mirrorReduction=True):
+        self.helperIndex = helperIndex
+        self.table = table
+        self.zobristKeys = zobristKeys
+        self.difficulty = difficulty
+        self.mirrorReduction = mirrorReduction
+        self.random = random.Random(helperIndex)
+        self.nodes = 0
+        self.repeatedLeaves = 0
+
+    # the moves in the order they are searched: the best move from the table first, then the generated order for
+    # the first helper and a random order for the other ones
+    # moveKeys = the moveKey of every move (None if there is no best move in the table)
+    def moveOrder(self, moveKeys, movesNumber, bestMove):
+        order = list(range(movesNumber))
+        if self.helperIndex:
+            self.random.shuffle(order)
+        if bestMove is not None and bestMove in moveKeys:
+            bestIndex = moveKeys.index(bestMove)
+            order.remove(bestIndex)
+            order.insert(0, bestIndex)
+        return order
+
+    def alphaBeta(self, alpha, beta, currentState, isRoot=False):
+        self.nodes += 1
+        if self.nodes % 256 == 0 and self.table.control[controlStop]:
+            raise SearchStopped()
+
+        if currentState.currentDepth == 0 or currentState.repeated or currentState.gameTable.finalGame():
+            if currentState.repeated:
+                self.repeatedLeaves += 1
+            currentState.currentScore = currentState.gameTable.scoreEstimation(currentState.currentDepth,
+                                                                               self.difficulty,
+                                                                               currentState.playerMax)
+            return currentState
+
+        key, mirrored = self.zobristKeys.positionHash(currentState.gameTable, currentState.currentGame)
+        entry = self.table.probe(key)
+        bestMove = None
+        if entry is not None:
+            score, depth, flag, bestMove = entry
+            # the root always searches its moves, so there is a move to play
+            if depth == currentState.currentDepth and not isRoot:
+                if flag == tableExact:
+                    currentState.currentScore = score
+                    return currentState
+                if flag == tableLowerBound:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if alpha >= beta:
+                    currentState.currentScore = score
+                    return currentState
+        alphaBefore, betaBefore = alpha, beta
+        repeatedLeavesBefore = self.repeatedLeaves
+
+        currentState.enterLine()
+        currentState.listOfPossibleMovesOfCurrentGame = currentState.startMoving()
+        moves = currentState.listOfPossibleMovesOfCurrentGame
+        moveKeys = [moveKey(currentState.gameTable, oneMove.gameTable, currentState.currentGame, mirrored)
+                    for oneMove in moves]
+        bestIndex = None
+        playerMax = currentState.currentGame == currentState.playerMax
+        currentScore = float('-inf') if playerMax else float('inf')
+        for index in self.moveOrder(moveKeys, len(moves), bestMove):
+            newState = self.alphaBeta(alpha, beta, moves[index])
+
+            if playerMax:
+                if currentScore < newState.currentScore:
+                    currentState.chosenMove = newState
+                    currentScore = newState.currentScore
+                    bestIndex = index
+                alpha = max(alpha, newState.currentScore)
+            else:
+                if currentScore > newState.currentScore:
+                    currentState.chosenMove = newState
+                    currentScore = newState.currentScore
+                    bestIndex = index
+                beta = min(beta, newState.currentScore)
+            if alpha >= beta:
+                break
+
+        currentState.leaveLine()
+        currentState.currentScore = currentState.chosenMove.currentScore
+        if self.repeatedLeaves > repeatedLeavesBefore:
+            return currentState
+        if currentScore <= alphaBefore:
+            flag = tableUpperBound
+        elif currentScore >= betaBefore:
+            flag = tableLowerBound
+        else:
+            flag = tableExact
+        self.table.store(key, currentScore, currentState.currentDepth, flag, moveKeys[bestIndex])
+        return currentState
+
+
+# the process of a helper: iterative deepening until maxDepth or until the main process stops it
+# every completed depth is sent to results as (helper, depth, move, score, nodes, seconds)
+# the helpers with an odd index search one depth ahead; a helper skips the depths completed by other helpers
+def lazySearchProcess(helperIndex, sharedMemory, entriesNumber, position, side, maxDepth, difficulty,
+                      mirrorReduction, history, repetitionDetection, results):
+    table = SharedTranspositionTable(sharedMemory, entriesNumber)
+    helper = LazySearchHelper(helperIndex, table, ZobristKeys(position.board), difficulty, mirrorReduction)
+    timeBefore = time.perf_counter()
+    currentDepth = helperIndex % 2
+    try:
+        while currentDepth < maxDepth:
+            currentDepth = min(max(currentDepth + 1, int(table.control[controlCompletedDepth]) + 1 +
+                                   helperIndex % 2), maxDepth)
+            repetitions = repetitionsFromHistory(history) if repetitionDetection else None
+            currentState = Solve(position, side, currentDepth, side, mirrorReduction=mirrorReduction,
+                                 repetitions=repetitions)
+            helper.alphaBeta(-5000, 5000, currentState, True)
+            move = position.findMoveTo(currentState.chosenMove.gameTable, side)
+            if currentDepth > table.control[controlCompletedDepth]:
+                table.control[controlCompletedDepth] = currentDepth
+            results.put((helperIndex, currentDepth, move, currentState.currentScore, helper.nodes,
+                         time.perf_counter() - timeBefore))
+    except SearchStopped:
+        pass
+    results.put((helperIndex, None, None, None, helper.nodes, time.perf_counter() - timeBefore))
+
+
+# searches the best move of side from position with Lazy SMP on processesNumber processes (all the cores by default)
+# the same arguments and results as search.search (alpha_beta only); the result is the deepest completed depth of
+# any helper; stats also has 'processes' and 'depthTimes' ({depth: seconds until the first helper completed it})
+# tableEntries = the number of entries of the transposition table (24 bytes each)
+def parallelSearch(position, side, depth=None, timeBudget=None, processesNumber=None, difficulty=10,
+                   mirrorReduction=True, history=(), repetitionDetection=False, tableEntries=1 << 20):
+    if depth is None and timeBudget is None:
+        raise ValueError("Give the depth or the time budget of the search")
+    if depth is not None and depth < 1:
+        raise ValueError("The depth of the search must be at least 1")
+    processesNumber = processesNumber or os.cpu_count() or 1
+
+    timeBefore = time.perf_counter()
+    stats = {'nodes': 0, 'depth': 0, 'time': 0, 'processes': processesNumber, 'depthTimes': {}}
+    if position.finalGame() or not position.generateNextMoves(side):
+        stats['time'] = time.perf_counter() - timeBefore
+        return None, position.scoreEstimation(0, difficulty, side), stats
+
+    sharedMemory = shared_memory.SharedMemory(create=True, size=SharedTranspositionTable.memorySize(tableEntries))
+    table = SharedTranspositionTable(sharedMemory, tableEntries)
+    table.entries[:] = 0
+    table.control[:] = 0
+    results = multiprocessing.Queue()
+    helpers = [multiprocessing.Process(target=lazySearchProcess,
+                                       args=(helperIndex, sharedMemory, tableEntries, position, side, depth or 100,
+                                             difficulty, mirrorReduction, list(history), repetitionDetection,
+                                             results), daemon=True)
+               for helperIndex in range(processesNumber)]
+    for helper in helpers:
+        helper.start()
+
+    bestResult = None
+    helperNodes = [0] * processesNumber
+    finishedHelpers = 0
+    searchTime = None if timeBudget is None else max(timeBudget - helperStopTime, timeBudget / 2)
+    try:
+        while finishedHelpers < processesNumber:
+            remainingTime = 0.1 if searchTime is None else searchTime - (time.perf_counter() - timeBefore)
+            if remainingTime <= 0:
+                break
+            try:
+                helperIndex, resultDepth, move, score, nodes, seconds = results.get(timeout=min(remainingTime, 0.1))
+            except queue.Empty:
+                if not any(helper.is_alive() for helper in helpers):  # a helper stopped with an error
+                    break
+                continue
+            helperNodes[helperIndex] = nodes
+            if resultDepth is None:
+                finishedHelpers += 1
+                continue
+            stats['depthTimes'].setdefault(resultDepth, time.perf_counter() - timeBefore)
+            if bestResult is None or resultDepth > bestResult[0]:
+                bestResult = resultDepth, move, score
+            if depth is not None and resultDepth >= depth:
+                break
+    finally:
+        table.control[controlStop] = 1
+        stopDeadline = time.perf_counter() + helperStopTime
+        for helper in helpers:
+            helper.join(max(stopDeadline - time.perf_counter(), 0))
+        for helper in helpers:
+            if helper.is_alive():
+                helper.terminate()
+                helper.join()
+        # the last node counts of the stopped helpers
+        while True:
+            try:
+                helperIndex, resultDepth, move, score, nodes, seconds = results.get_nowait()
+                helperNodes[helperIndex] = max(helperNodes[helperIndex], nodes)
+            except queue.Empty:
+                break
+        del table
+        sharedMemory.close()
+        sharedMemory.unlink()
+
+    stats['nodes'] = sum(helperNodes)
+    if bestResult is None:  # no depth was completed inside the time budget, so the move is searched at depth 1
+        move, score, searchStats = search(position, side, depth=1, difficulty=difficulty,
+                                          mirrorReduction=mirrorReduction, history=history,
+                                          repetitionDetection=repetitionDetection)
+        bestResult = 1, move, score
+        stats['nodes'] += searchStats['nodes']
+    stats['time'] = time.perf_counter() - timeBefore
+    stats['depth'], move, score = bestResult
+    return move, score, stats
@@ -0,0 +1,85 @@
+import cProfile
+import io
+import os
+import pstats
+import time
+
+# the environment variable that turns on the profiling of the computer's moves (its value is the directory of the
+# profile files), the same as main(profileDirectory=...)
+profileEnvironmentVariable = 'HARE_HOUNDS_PROFILE'
+
+# the functions always shown in the summary of the game (if they were called)
+watchedFunctions = ['startMoving', 'generateNextMoves', 'legalMoves', 'findLegalMoves', 'cachedValue',
+                    'heuristicScore', 'finalGame', 'tableFinalGame', 'scoreEstimation', 'weightedScore',
+                    'findSymbolPosition', 'cityblock', 'euclideanDistance', 'proofNumberMove']
+
+
+# the directory of the profile files from the environment variable or None if the profiling is off
+def profileDirectoryFromEnvironment():
+    return os.environ.get(profileEnvironmentVariable) or None
+
+
+# cProfile around every search of the computer (startMove / endMove)
+# every game is written to its own directory inside directory (game_<date>_<time>), every move to its own file
+# (move_001.prof, ... - open them with pstats or snakeviz) and all the moves of the game are added together for the
+# summary of the game (summary.txt)
+# the profiler is created only when the profiling is on, so there is no cost when it is off
+class MoveProfiler:
+    def __init__(self, directory, topFunctions=25):
+        self.directory = gameDirectory(directory)
+        self.topFunctions = topFunctions
+        self.movesNumber = 0
+        self.gameStats = None
+        self.profile = None
+
+    def startMove(self):
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def endMove(self):
+        self.profile.disable()
+        self.movesNumber += 1
+        moveFile = os.path.join(self.directory, 'move_{:03d}.prof'.format(self.movesNumber))
+        self.profile.dump_stats(moveFile)
+        if self.gameStats is None:
+            self.gameStats = pstats.Stats(moveFile)
+        else:
+            self.gameStats.add(moveFile)
+        self.profile = None
+        return moveFile
+
+    # the top functions by cumulative time for all the moves of the game, written to summary.txt
+    # returns the path of the summary or None if the computer did not move
+    def writeSummary(self):
+        if self.gameStats is None:
+            return None
+        output = io.StringIO()
+        self.gameStats.stream = output
+        print("Computer moves profiled: " + str(self.movesNumber), file=output)
+        self.gameStats.sort_stats('cumulative').print_stats(self.topFunctions)
+
+        print("Watched functions (calls, total time, cumulative time):", file=output)
+        for (fileName, line, functionName), (primitiveCalls, calls, totalTime, cumulativeTime, callers) in \
+                sorted(self.gameStats.stats.items(), key=lambda item: -item[1][3]):
+            if functionName in watchedFunctions:
+                print("{:>10} {:10.3f} s {:10.3f} s  {} ({}:{})".format(calls, totalTime, cumulativeTime, functionName,
+                                                                      os.path.basename(fileName), line), file=output)
+
+        summaryFile = os.path.join(self.directory, 'summary.txt')
+        with open(summaryFile, 'w') as file:
+            file.write(output.getvalue())
+        return summaryFile
+
+
+# a new directory for the profiles of a game inside directory (a number is added if the name is already used)
+def gameDirectory(directory):
+    name = os.path.join(directory, time.strftime('game_%Y%m%d_%H%M%S'))
+    path = name
+    number = 1
+    while True:
+        try:
+            os.makedirs(path)
+            return path
+        except FileExistsError:
+            number += 1
+            path = "{}_{}".format(name, number)
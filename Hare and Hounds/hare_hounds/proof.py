@@ -0,0 +1,137 @@
+import time
+
+from .game import otherPlayer
+from .hashing import ZobristKeys
+
+# proof numbers bigger than all the others (the position is proven or disproven)
+proofInfinity = 10 ** 8
+proofEpsilon = 0.25
+# the positions searched by the proof-number search before every move of the computer (console and pygame, alpha-beta
+# on the harder difficulties) for every level of the chosen depth: the start of the game is proven in about 4800
+# positions, so a deep search plays the forced win from the first move and a shallow one only after more moves (the
+# table of the game is kept, so every move continues the proof)
+proofNodesPerDepth = 500
+
+
+# depth-first proof-number search (df-pn): proves or disproves that the player to move can force a win, without a
+# depth limit (the hounds can not go backwards and the vertical moves end the game, so every game ends)
+# for every position the table keeps (phi, delta) for the player to move: phi = the proof number of his win,
+# delta = its disproof number; phi = 0 - he wins, delta = 0 - he loses
+# the table is shared by a position and its mirror: the key is the smallest of their Zobrist hashes (with the player
+# to move), and the hashes of the next positions are found from the moves; a player that can not move loses
+# the table is kept between the calls of prove, so one search can be used for all the moves of a game (on one board):
+# the positions already proven are not searched again
+# nodeLimit = the positions expanded by every call of prove
+# deadline = time.perf_counter() value after which the search stops like at the node limit (None - no deadline)
+class ProofNumberSearch:
+    def __init__(self, nodeLimit=20000, deadline=None):
+        self.nodeLimit = nodeLimit
+        self.deadline = deadline
+        self.nodes = 0  # the expanded positions of the last call of prove
+        self.table = {}
+        self.zobristKeys = None  # made for the board of the first position
+
+    def positionHashes(self, position, currentPlayer):
+        if self.zobristKeys is None:
+            self.zobristKeys = ZobristKeys(position.board)
+        return self.zobristKeys.positionHashes(position, currentPlayer)
+
+    # the next positions of currentPlayer with their hashes
+    def nextPositions(self, position, currentPlayer, hashes):
+        nextMoves = position.generateNextMoves(currentPlayer)
+        return nextMoves, [self.zobristKeys.moveHashes(hashes, position, nextMove, currentPlayer, move)
+                           for nextMove, move in zip(nextMoves, position.legalMoves(currentPlayer))]
+
+    # (phi, delta) of a position that was not searched yet
+    def initialNumbers(self, position, currentPlayer):
+        winner = position.finalGame()
+        if not winner:
+            return 1, 1
+        if winner == currentPlayer:
+            return 0, proofInfinity
+        return proofInfinity, 0
+
+    # key = the smallest of the hashes of the position
+    def proofNumbers(self, position, currentPlayer, key):
+        numbers = self.table.get(key)
+        if numbers is None:
+            numbers = self.table[key] = self.initialNumbers(position, currentPlayer)
+        return numbers
+
+    # searches the position until phi >= thresholdPhi or delta >= thresholdDelta (or the node limit is reached)
+    def multipleIterativeDeepening(self, position, currentPlayer, hashes, thresholdPhi, thresholdDelta):
+        key = min(hashes)
+        phi, delta = self.proofNumbers(position, currentPlayer, key)
+        if phi >= thresholdPhi or delta >= thresholdDelta or phi == 0 or delta == 0:
+            return
+
+        self.nodes += 1
+        nextPlayer = otherPlayer(currentPlayer)
+        nextMoves, childHashes = self.nextPositions(position, currentPlayer, hashes)
+        if not nextMoves:
+            self.table[key] = proofInfinity, 0
+            return
+
+        childKeys = [min(nextHashes) for nextHashes in childHashes]
+        while True:
+            childNumbers = [self.proofNumbers(nextMove, nextPlayer, childKey)
+                            for nextMove, childKey in zip(nextMoves, childKeys)]
+            phi = min(childDelta for childPhi, childDelta in childNumbers)
+            # the disproof number is the biggest one of the children plus one for every other child, not their sum
+            # (weak proof numbers): the hare can reach the same table in many ways, so the sum counts the same
+            # positions more times
+            openChildren = [childPhi for childPhi, childDelta in childNumbers if childPhi]
+            delta = min(max(openChildren) + len(openChildren) - 1, proofInfinity) if openChildren else 0
+            if phi >= thresholdPhi or delta >= thresholdDelta or self.nodes >= self.nodeLimit or \
+                    (self.deadline is not None and time.perf_counter() > self.deadline):
+                break
+
+            # the child with the smallest proof number of the win (its delta) and the second smallest one
+            bestChild = min(range(len(nextMoves)), key=lambda child: childNumbers[child][1])
+            secondDelta = min([childDelta for child, (childPhi, childDelta) in enumerate(childNumbers)
+                               if child != bestChild], default=proofInfinity)
+            bestPhi = childNumbers[bestChild][0]
+            childThresholdPhi = min(thresholdDelta - delta + bestPhi, proofInfinity)
+            # the 1 + epsilon trick: the best child is searched a bit longer before switching to the second one
+            childThresholdDelta = min(thresholdPhi, int(secondDelta * (1 + proofEpsilon)) + 1)
+            self.multipleIterativeDeepening(nextMoves[bestChild], nextPlayer, childHashes[bestChild], childThresholdPhi,
+                                            childThresholdDelta)
+
+        self.table[key] = phi, delta
+
+    # True - currentPlayer can force a win, False - he can not, None - not known inside the node limit
+    def prove(self, position, currentPlayer):
+        self.nodes = 0
+        hashes = self.positionHashes(position, currentPlayer)
+        self.multipleIterativeDeepening(position, currentPlayer, hashes, proofInfinity, proofInfinity)
+        phi, delta = self.proofNumbers(position, currentPlayer, min(hashes))
+        if phi == 0:
+            return True
+        if delta == 0:
+            return False
+        return None
+
+    # the next position of a proven win (the other player loses from it) or None
+    def winningMove(self, position, currentPlayer):
+        nextPlayer = otherPlayer(currentPlayer)
+        nextMoves, childHashes = self.nextPositions(position, currentPlayer,
+                                                    self.positionHashes(position, currentPlayer))
+        for nextMove, nextHashes in zip(nextMoves, childHashes):
+            if self.proofNumbers(nextMove, nextPlayer, min(nextHashes))[1] == 0:
+                return nextMove
+        return None
+
+
+# the next position if currentPlayer has a forced win from position (found inside nodeLimit positions), else None
+# returns (next position or None, stats): stats = {'nodes', 'time', 'proven': True / False / None}
+# proofSearch = a ProofNumberSearch kept between the moves of a game (None - a new one): its table is used again, so a
+# win proven at one move is played at the next moves without searching it again
+def proofNumberMove(position, currentPlayer, nodeLimit=20000, deadline=None, proofSearch=None):
+    timeBefore = time.perf_counter()
+    if proofSearch is None:
+        proofSearch = ProofNumberSearch(nodeLimit, deadline)
+    else:
+        proofSearch.nodeLimit, proofSearch.deadline = nodeLimit, deadline
+    proven = proofSearch.prove(position, currentPlayer)
+    nextMove = proofSearch.winningMove(position, currentPlayer) if proven else None
+    return nextMove, {'nodes': proofSearch.nodes, 'time': time.perf_counter() - timeBefore, 'proven': proven}
@@ -0,0 +1,148 @@
+import mmap
+import os
+import struct
+
+from .board import classicBoard
+from .game import Game, initialGame, otherPlayer
+
+
+# binary game records
+# file: RECORD_MAGIC + version, then the games one after the other
+# game: header (algorithm, difficulty, max depth, player symbol, winner, number of moves) + one byte per move
+# the games left before the end (exit or closing the window) are written with no winner
+# a move is (from, to) on the 11 positions of the game table, stored as from * 11 + to
+RECORD_MAGIC = b'HHGR'
+RECORD_VERSION = 1
+RECORD_GAME_HEADER = struct.Struct('<BBBBBH')
+RECORD_CELLS = 11
+# the max depth is stored in one byte
+RECORD_MAX_DEPTH = 255
+
+# the symbols are stored as numbers inside the records; 0 - no winner (the game was not finished)
+recordSymbols = {'c': 1, 'i': 2}
+recordSymbolsReversed = {0: False, 1: 'c', 2: 'i'}
+
+
+def encodeMove(positionFrom, positionTo):
+    return positionFrom * RECORD_CELLS + positionTo
+
+
+def decodeMove(move):
+    return move // RECORD_CELLS, move % RECORD_CELLS
+
+
+# the settings of the engine written in the header of every game
+def recordSettings(algorithm, difficulty, maxDepth, player):
+    return {'algorithm': int(algorithm), 'difficulty': difficulty, 'maxDepth': maxDepth, 'player': player}
+
+
+# append only writer; the games are kept in a buffer and written with one fsync for every fsyncEvery games
+# a file that is not empty must start with RECORD_MAGIC and RECORD_VERSION (else ValueError), so the games are not
+# appended to another file or to the records of another version
+class GameRecordWriter:
+    def __init__(self, path, fsyncEvery=64, board=classicBoard):
+        if board.cellsNumber != RECORD_CELLS:
+            raise ValueError("The game records can be written only for the classic 3x5 board")
+        self.path = path
+        self.fsyncEvery = fsyncEvery
+        self.buffer = bytearray()
+        self.gamesInBuffer = 0
+        self.file = open(path, 'a+b')
+        self.file.seek(0, os.SEEK_END)
+        if self.file.tell() == 0:
+            self.file.write(RECORD_MAGIC + bytes([RECORD_VERSION]))
+        else:
+            self.file.seek(0)
+            fileHeader = self.file.read(len(RECORD_MAGIC) + 1)
+            if fileHeader != RECORD_MAGIC + bytes([RECORD_VERSION]):
+                self.file.close()
+                raise ValueError("Not a game record file of version {}: {}".format(RECORD_VERSION, path))
+
+    def writeGame(self, settings, moves, winner):
+        if not 0 <= settings['maxDepth'] <= RECORD_MAX_DEPTH:
+            raise ValueError("The max depth of a recorded game must be between 0 and " + str(RECORD_MAX_DEPTH))
+        self.buffer += RECORD_GAME_HEADER.pack(settings['algorithm'], settings['difficulty'], settings['maxDepth'],
+                                               recordSymbols[settings['player']],
+                                               recordSymbols.get(winner, 0), len(moves))
+        self.buffer += bytes(moves)
+        self.gamesInBuffer += 1
+        if self.gamesInBuffer >= self.fsyncEvery:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.file.write(self.buffer)
+            self.buffer = bytearray()
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.gamesInBuffer = 0
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+
+# memory mapped reader; the games are read one by one, without loading the whole file
+# a game cut off inside its header or inside its moves raises ValueError
+class GameRecordReader:
+    def __init__(self, path):
+        self.path = path
+
+    def __iter__(self):
+        with open(self.path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if data[:len(RECORD_MAGIC) + 1] != RECORD_MAGIC + bytes([RECORD_VERSION]):
+                    raise ValueError("Not a game record file: " + self.path)
+
+                offset = len(RECORD_MAGIC) + 1
+                while offset < len(data):
+                    if offset + RECORD_GAME_HEADER.size > len(data):
+                        raise ValueError("Truncated game record header at byte " + str(offset))
+                    algorithm, difficulty, maxDepth, player, winner, movesNumber = \
+                        RECORD_GAME_HEADER.unpack_from(data, offset)
+                    offset += RECORD_GAME_HEADER.size
+                    if offset + movesNumber > len(data):
+                        raise ValueError("Truncated game record at byte " + str(offset))
+                    settings = recordSettings(algorithm, difficulty, maxDepth, recordSymbolsReversed[player])
+                    yield settings, data[offset:offset + movesNumber], recordSymbolsReversed[winner]
+                    offset += movesNumber
+
+
+# replays every game from the file and checks every move with legalMove
+# returns the number of games and moves replayed; raises ValueError at the first invalid move
+def replayGameRecords(path):
+    gamesNumber = 0
+    movesNumber = 0
+    for settings, moves, winner in GameRecordReader(path):
+        gamesNumber += 1
+        game = initialGame()
+        currentPlayer = Game.playerSymbols[0]  # hounds moves first
+
+        for move in moves:
+            movesNumber += 1
+            positionFrom, positionTo = decodeMove(move)
+            rowFrom, colFrom = game.getPositionFromGameTable(positionFrom)
+            rowTo, colTo = game.getPositionFromGameTable(positionTo)
+
+            if game.finalGame() or rowFrom == -1 or rowTo == -1 or \
+                    game.table[rowFrom][colFrom] != currentPlayer or game.table[rowTo][colTo] != Game.gameGoal or \
+                    not game.legalMove(currentPlayer, rowFrom, colFrom, rowTo, colTo):
+                raise ValueError("Game {}: invalid move {} -> {} for {}".format(gamesNumber, positionFrom, positionTo,
+                                                                                currentPlayer))
+
+            game.makeMove(currentPlayer, rowFrom, colFrom, rowTo, colTo)
+            currentPlayer = otherPlayer(currentPlayer)
+
+        if game.finalGame() != winner:
+            raise ValueError("Game {}: the winner recorded is not the winner after the replay".format(gamesNumber))
+
+    return gamesNumber, movesNumber
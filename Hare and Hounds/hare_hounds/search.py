@@ -0,0 +1,272 @@
+import time
+
+from .game import otherPlayer
+from .proof import proofNumberMove
+
+
+# raised inside a search when its deadline passed (or when a parallel search is stopped)
+class SearchStopped(Exception):
+    pass
+
+
+# Solve class is not changing during the game
+class Solve:
+    # Solve constructor
+    # playerMax = the player of the computer (the scores are calculated for him)
+    # mirrorReduction = on a symmetric table, search only one move from every pair of mirrored moves
+    # repetitions = the tables (and the player to move) of the game history and of the current line of the search,
+    # shared by all the states of a search (None = no repetition detection)
+    def __init__(self, gameTable, currentGame, depth, playerMax, score=None, mirrorReduction=True, repetitions=None):
+        self.gameTable = gameTable  # Game type
+        self.currentGame = currentGame  # current player game
+        self.currentDepth = depth
+        self.playerMax = playerMax
+        self.currentScore = score
+        self.mirrorReduction = mirrorReduction
+        self.repetitions = repetitions
+        # the table was already reached on the current line or in the game: it is a leaf scored with the heuristic
+        # (only vertical moves of the hounds can lead back to a table, and the hounds can leave the cycle with any
+        # other move, so the repetition is not a win of the hare unless the game ended with houndsVerticalMoves >= 10)
+        self.repeated = False
+        self.listOfPossibleMovesOfCurrentGame = []
+        self.chosenMove = None
+
+    def __str__(self):
+        return str(self.gameTable) + "(Current game: " + self.currentGame + ")\n"
+
+    # function to change the current player
+    def changePlayer(self):
+        return otherPlayer(self.currentGame)
+
+    def startMoving(self):
+        # Generate the moves for the current game
+        movesOfCurrentGame = self.gameTable.generateNextMoves(self.currentGame)
+        if self.mirrorReduction and self.gameTable.isSymmetric():
+            movesOfCurrentGame = uniqueMirroredMoves(movesOfCurrentGame)
+        otherPlayer = self.changePlayer()  # change the current player
+        # generate the list of moves for the changed player
+        listOfMoves = [Solve(oneMove, otherPlayer, self.currentDepth - 1, self.playerMax,
+                             mirrorReduction=self.mirrorReduction, repetitions=self.repetitions)
+                       for oneMove in movesOfCurrentGame]
+        if self.repetitions is not None:
+            for oneMove in listOfMoves:
+                oneMove.repeated = oneMove.repetitionKey() in self.repetitions
+
+        return listOfMoves
+
+    def repetitionKey(self):
+        return repetitionKey(self.gameTable, self.currentGame)
+
+    # the current line of the search goes through this state (the stack of the tables is kept in repetitions)
+    def enterLine(self):
+        if self.repetitions is not None:
+            key = self.repetitionKey()
+            self.repetitions[key] = self.repetitions.get(key, 0) + 1
+
+    def leaveLine(self):
+        if self.repetitions is not None:
+            key = self.repetitionKey()
+            self.repetitions[key] -= 1
+            if self.repetitions[key] == 0:
+                del self.repetitions[key]
+
+
+# the key of a position for the repetitions: the table (or its mirror) and the player to move
+def repetitionKey(position, currentPlayer):
+    return position.tableKey(), currentPlayer
+
+
+# the repetitions for the root of a search from the game history (the Game positions before the current one, each
+# one with the player that moved from it)
+def repetitionsFromHistory(history):
+    repetitions = {}
+    for position, currentPlayer in history:
+        key = repetitionKey(position, currentPlayer)
+        repetitions[key] = repetitions.get(key, 0) + 1
+    return repetitions
+
+
+# keeps only the first move from every pair of mirrored moves
+# used on a symmetric table, where a move and its mirror have the same score; the kept moves are real moves
+def uniqueMirroredMoves(movesList):
+    uniqueMoves = []
+    foundKeys = set()
+    for oneMove in movesList:
+        if oneMove.mirrorKey() not in foundKeys:
+            uniqueMoves.append(oneMove)
+            foundKeys.add(oneMove.positionKey())
+    return uniqueMoves
+
+
+# min_max function algorithm
+# difficulty = the difficulty of the game
+# deadline = time.perf_counter() value after which the search is stopped with SearchStopped (None - no deadline)
+def min_max(currentState, difficulty, deadline=None):  # stare -> Solve type
+    if deadline is not None and time.perf_counter() > deadline:
+        raise SearchStopped()
+    if currentState.currentDepth == 0 or currentState.repeated or currentState.gameTable.finalGame():
+        currentState.currentScore = currentState.gameTable.scoreEstimation(currentState.currentDepth, difficulty,
+                                                                           currentState.playerMax)
+        return currentState
+
+    currentState.enterLine()
+    currentState.listOfPossibleMovesOfCurrentGame = currentState.startMoving()
+
+    scoreAfterMoving = [min_max(oneMove, difficulty, deadline)
+                        for oneMove in currentState.listOfPossibleMovesOfCurrentGame]
+    currentState.leaveLine()
+
+    if currentState.currentGame == currentState.playerMax:
+        currentState.chosenMove = max(scoreAfterMoving, key=lambda x: x.currentScore)
+    else:
+        currentState.chosenMove = min(scoreAfterMoving, key=lambda x: x.currentScore)
+
+    currentState.currentScore = currentState.chosenMove.currentScore
+
+    return currentState
+
+
+# alpha beta function algorithm
+def alpha_beta(alpha, beta, currentState, difficulty, deadline=None):
+    if deadline is not None and time.perf_counter() > deadline:
+        raise SearchStopped()
+    if currentState.currentDepth == 0 or currentState.repeated or currentState.gameTable.finalGame():
+        currentState.currentScore = currentState.gameTable.scoreEstimation(currentState.currentDepth, difficulty,
+                                                                           currentState.playerMax)
+        return currentState
+
+    if alpha > beta:
+        return currentState
+
+    currentState.enterLine()
+    currentState.listOfPossibleMovesOfCurrentGame = currentState.startMoving()
+
+    if currentState.currentGame == currentState.playerMax:
+        currentScore = float('-inf')
+
+        for oneMove in currentState.listOfPossibleMovesOfCurrentGame:
+            newState = alpha_beta(alpha, beta, oneMove, difficulty, deadline)
+
+            if currentScore < newState.currentScore:
+                currentState.chosenMove = newState
+                currentScore = newState.currentScore
+
+            if alpha < newState.currentScore:
+                alpha = newState.currentScore
+                if alpha >= beta:
+                    break
+
+    else:
+        currentScore = float('inf')
+
+        for oneMove in currentState.listOfPossibleMovesOfCurrentGame:
+            newState = alpha_beta(alpha, beta, oneMove, difficulty, deadline)
+
+            if currentScore > newState.currentScore:
+                currentState.chosenMove = newState
+                currentScore = newState.currentScore
+
+            if beta > newState.currentScore:
+                beta = newState.currentScore
+                if alpha >= beta:
+                    break
+
+    currentState.leaveLine()
+    currentState.currentScore = currentState.chosenMove.currentScore
+
+    return currentState
+
+
+# the number of positions searched by min_max / alpha_beta (the states that received a score)
+def countSearchedNodes(currentState):
+    nodesNumber = 0
+    states = [currentState]
+    while states:
+        state = states.pop()
+        if state.currentScore is not None:
+            nodesNumber += 1
+            states += state.listOfPossibleMovesOfCurrentGame
+    return nodesNumber
+
+
+# the algorithms that can be used by search (the console and pygame use '1' and '2')
+algorithms = {'min_max': '1', 'alpha_beta': '2', '1': '1', '2': '2'}
+
+
+# searches the best move of side (the player to move) from position (Game type)
+# the search is done with a fixed depth or, with timeBudget (seconds), with iterative deepening: the depth is
+# increased until the budget is over (depth is then the maximum depth); a depth still searched when the budget is over
+# is stopped and the result of the last completed depth is returned (depth 1 is always completed, so there is a move)
+# returns (move, score, stats): move = (position from, position to) on the game table or None if side can not move,
+# stats = {'nodes': the positions searched at all the depths, 'depth': the deepest completed depth, 'time': seconds}
+# history = the positions of the game before this one, with the player that moved from them (for the repetitions)
+# repetitionDetection = do not search again the tables already reached (see Solve.repeated); off by default, because
+# a repeated table has more vertical moves of the hounds than the first one, so the cut lines are the ones where the
+# hare plays for the win with 10 vertical moves (--repetitions: fewer nodes by at most a few percent and more games
+# lost)
+# proofNodes = first look for a forced win of side with the proof-number search (at most proofNodes positions, 0 - off);
+# a proven win is played at once with the score 999 (stats['proofNodes'] = the positions of the proof-number search)
+# nothing is shared between the calls, so more searches can run at the same time (threads)
+def search(position, side, algorithm='alpha_beta', depth=None, timeBudget=None, difficulty=10, mirrorReduction=True,
+           history=(), repetitionDetection=False, proofNodes=0):
+    if algorithm not in algorithms:
+        raise ValueError("Unknown algorithm: " + str(algorithm))
+    if depth is None and timeBudget is None:
+        raise ValueError("Give the depth or the time budget of the search")
+    if depth is not None and depth < 1:
+        raise ValueError("The depth of the search must be at least 1")
+
+    timeBefore = time.perf_counter()
+    if timeBudget is None:
+        depths = [depth]
+        deadline = None
+    else:
+        depths = range(1, (depth or 100) + 1)
+        deadline = timeBefore + timeBudget
+
+    stats = {'nodes': 0, 'depth': 0, 'time': 0}
+    if not position.finalGame() and not position.generateNextMoves(side):
+        return None, position.scoreEstimation(0, difficulty, side), stats
+
+    if proofNodes and not position.finalGame():
+        nextGame, proofStats = proofNumberMove(position, side, proofNodes, deadline)
+        stats['proofNodes'] = proofStats['nodes']
+        if nextGame is not None:
+            stats['time'] = time.perf_counter() - timeBefore
+            return position.findMoveTo(nextGame, side), 999, stats
+
+    completedState = None
+    previousTime = None
+    for currentDepth in depths:
+        iterationBefore = time.perf_counter()
+        repetitions = repetitionsFromHistory(history) if repetitionDetection else None
+        currentState = Solve(position, side, currentDepth, side, mirrorReduction=mirrorReduction,
+                             repetitions=repetitions)
+        try:
+            if algorithms[algorithm] == '1':
+                min_max(currentState, difficulty, deadline if completedState else None)
+            else:
+                alpha_beta(-5000, 5000, currentState, difficulty, deadline if completedState else None)
+        except SearchStopped:
+            stats['nodes'] += countSearchedNodes(currentState)
+            break
+        iterationTime = time.perf_counter() - iterationBefore
+
+        completedState = currentState
+        stats['nodes'] += countSearchedNodes(currentState)
+        stats['depth'] = currentDepth
+        if currentState.chosenMove is None or timeBudget is None:
+            break
+
+        # the next depth takes about (this depth / previous depth) times longer, so it is not started if it can not
+        # finish inside the budget
+        growth = iterationTime / previousTime if previousTime else 4
+        previousTime = iterationTime
+        if time.perf_counter() - timeBefore + iterationTime * max(growth, 1) > timeBudget:
+            break
+
+    stats['time'] = time.perf_counter() - timeBefore
+    if completedState.chosenMove is None:
+        return None, completedState.currentScore, stats
+    move = position.findMoveTo(completedState.chosenMove.gameTable, side)
+    return move, completedState.currentScore, stats
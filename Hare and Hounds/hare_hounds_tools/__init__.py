@@ -0,0 +1,15 @@
+# Hare and Hounds tools, used by "Hare and Hounds.py" from this folder and not installed with hare_hounds
+# the regression checks against the search of the original script (legacy.py), the benchmarks and the tuning of the
+# heuristic weights
+from .benchmark import benchmarkBatchMoves, benchmarkBoards, benchmarkParallelSearch, benchmarkProofNumber, \
+    benchmarkRepetitions
+from .regression import compareWithLegacy, generateRegressionCorpus, loadRegressionCorpus, regressionBaselineFile, \
+    regressionCorpusFile, runRegression
+from .tuning import heuristicWeightsFile, loadHeuristicWeights, matchGame, matchHeuristicWeights, \
+    saveHeuristicWeights, selfPlayGame, tuneHeuristicWeights
+
+__all__ = ['benchmarkBatchMoves', 'benchmarkBoards', 'benchmarkParallelSearch', 'benchmarkProofNumber',
+           'benchmarkRepetitions', 'compareWithLegacy', 'generateRegressionCorpus', 'loadRegressionCorpus',
+           'regressionBaselineFile', 'regressionCorpusFile', 'runRegression', 'heuristicWeightsFile',
+           'loadHeuristicWeights', 'matchGame', 'matchHeuristicWeights', 'saveHeuristicWeights', 'selfPlayGame',
+           'tuneHeuristicWeights']
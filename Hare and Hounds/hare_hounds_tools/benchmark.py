@@ -0,0 +1,184 @@
+import os
+import time
+
+from hare_hounds.batch import BatchGenerator, batchNotFinal
+from hare_hounds.board import Board
+from hare_hounds.game import Game, initialGame, otherPlayer
+from hare_hounds.parallel import parallelSearch
+from hare_hounds.proof import proofNumberMove
+from hare_hounds.search import Solve, alpha_beta, countSearchedNodes, min_max, search
+
+
+# the nodes per second of both algorithms from the start of the game (the computer plays with the hounds)
+# on the classic board and on the bigger variants, without and with the mirror reduction
+def benchmarkBoards(depth, boards=((3, 5), (3, 7), (5, 9)), difficulty=10):
+    for rows, columns in boards:
+        board = Board(rows, columns)
+        for algorithm, name in [['1', 'min_max'], ['2', 'alpha_beta']]:
+            for mirrorReduction in [False, True]:
+                currentState = Solve(initialGame(board), 'c', depth, 'c', mirrorReduction=mirrorReduction)
+                timeBefore = time.perf_counter()
+                if algorithm == '1':
+                    min_max(currentState, difficulty)
+                else:
+                    alpha_beta(-5000, 5000, currentState, difficulty)
+                timeAfter = time.perf_counter() - timeBefore
+                nodesNumber = countSearchedNodes(currentState)
+                print("{} board, {} depth {}{}: {} nodes in {:.0f} ms ({:.0f} nodes/s)".format(
+                    board, name, depth, ", mirror reduction" if mirrorReduction else "",
+                    nodesNumber, timeAfter * 1000, nodesNumber / timeAfter))
+
+
+# positions where the hare can move back and forth and the hounds can move vertically (the player to move is last)
+stallPositions = [
+    ([[' ', 'c', '*', '*', ' '],
+      ['*', '*', 'c', '*', 'i'],
+      [' ', 'c', '*', '*', ' ']], 'i'),
+    ([[' ', '*', 'c', '*', ' '],
+      ['c', '*', '*', '*', '*'],
+      [' ', 'c', '*', 'i', ' ']], 'c'),
+    ([[' ', '*', '*', 'c', ' '],
+      ['*', 'c', '*', '*', 'i'],
+      [' ', '*', 'c', '*', ' ']], 'c'),
+]
+
+
+# one game from position, the hare played by engineHare and the hounds by engineHounds
+# an engine is (depth, repetitionDetection); returns the winner and the number of moves
+def playStallGame(position, currentPlayer, engineHare, engineHounds, difficulty=10, maxMoves=200):
+    history = []
+    movesNumber = 0
+    while not position.finalGame() and movesNumber < maxMoves:
+        depth, repetitionDetection = engineHare if currentPlayer == 'i' else engineHounds
+        move, score, stats = search(position, currentPlayer, depth=depth, difficulty=difficulty, history=history,
+                                    repetitionDetection=repetitionDetection)
+        if move is None:  # the player can not move anymore
+            return otherPlayer(currentPlayer), movesNumber
+        history.append((position, currentPlayer))
+        position = position.playMove(currentPlayer, *move)
+        currentPlayer = otherPlayer(currentPlayer)
+        movesNumber += 1
+    return position.finalGame(), movesNumber
+
+
+# the nodes searched from the stall positions without and with the repetition detection, and the games between an
+# engine with the repetition detection and one without it (both players, from every stall position)
+def benchmarkRepetitions(depth, difficulty=10):
+    for index, (table, currentPlayer) in enumerate(stallPositions):
+        position = Game(table, 0)
+        for repetitionDetection in [False, True]:
+            move, score, stats = search(position, currentPlayer, depth=depth, difficulty=difficulty,
+                                        repetitionDetection=repetitionDetection)
+            print("Stall position {}, depth {}{}: {} nodes in {:.0f} ms, move {}, score {}".format(
+                index, depth, ", repetition detection" if repetitionDetection else "", stats['nodes'],
+                stats['time'] * 1000, move, score))
+
+    wins = {True: 0, False: 0}
+    for index, (table, currentPlayer) in enumerate(stallPositions):
+        for hareDetection in [False, True]:
+            winner, movesNumber = playStallGame(Game([row.copy() for row in table], 0), currentPlayer,
+                                                (depth, hareDetection), (depth, not hareDetection), difficulty)
+            print("Stall position {}, hare {} and hounds {} the repetition detection: winner {} after {} moves".format(
+                index, "with" if hareDetection else "without", "without" if hareDetection else "with",
+                winner or "none", movesNumber))
+            if winner:
+                wins[hareDetection == (winner == 'i')] += 1
+    print("Games won with the repetition detection: {}, without: {}".format(wins[True], wins[False]))
+
+
+# the positions per second of the breadth-wise expansion (the next moves, the end of the game and the heuristic of
+# every position) from the start of the game, with the Game objects and with the batched arrays (BatchGenerator)
+def benchmarkBatchMoves(layers, boards=((3, 5), (3, 7), (5, 9)), difficulty=10):
+    for rows, columns in boards:
+        board = Board(rows, columns)
+
+        timeBefore = time.perf_counter()
+        games = [initialGame(board)]
+        currentPlayer = 'c'
+        positionsNumber = 0
+        for _ in range(layers):
+            games = [nextGame for game in games if not game.finalGame()
+                     for nextGame in game.generateNextMoves(currentPlayer)]
+            scores = [game.scoreEstimation(0, difficulty, 'c') for game in games]
+            positionsNumber += len(scores)
+            currentPlayer = otherPlayer(currentPlayer)
+        objectsTime = time.perf_counter() - timeBefore
+
+        timeBefore = time.perf_counter()
+        generator = BatchGenerator(board)
+        positions = generator.fromGames([initialGame(board)])
+        currentPlayer = 'c'
+        batchPositionsNumber = 0
+        for _ in range(layers):
+            notFinal = generator.finalGame(positions) == batchNotFinal
+            positions, parents = generator.generateNextMoves(tuple(array[notFinal] for array in positions),
+                                                             currentPlayer)
+            scores = generator.scoreEstimation(positions, 0, difficulty, 'c')
+            batchPositionsNumber += len(scores)
+            currentPlayer = otherPlayer(currentPlayer)
+        batchTime = time.perf_counter() - timeBefore
+
+        print("{} board, {} layers: {} positions, Game objects {:.0f} positions/s, batched {:.0f} positions/s "
+              "({:.1f}x){}".format(board, layers, positionsNumber, positionsNumber / objectsTime,
+                                   batchPositionsNumber / batchTime, objectsTime / batchTime,
+                                   "" if batchPositionsNumber == positionsNumber else " (different positions!)"))
+
+
+# the time to depth of the Lazy SMP search (parallelSearch) from the start of the game for 1 .. maxProcesses processes
+# (all the cores by default) and the speedup against one process; the sequential search is the first line
+def benchmarkParallelSearch(depth, maxProcesses=None, difficulty=10):
+    move, score, stats = search(initialGame(), 'c', depth=depth, difficulty=difficulty)
+    print("search, depth {}: {} nodes in {:.0f} ms, move {}, score {}".format(
+        depth, stats['nodes'], stats['time'] * 1000, move, score))
+
+    oneProcessTime = None
+    for processesNumber in range(1, (maxProcesses or os.cpu_count() or 1) + 1):
+        move, score, stats = parallelSearch(initialGame(), 'c', depth=depth, processesNumber=processesNumber,
+                                            difficulty=difficulty)
+        oneProcessTime = oneProcessTime or stats['time']
+        print("parallelSearch, {} processes, depth {}: {} nodes in {:.0f} ms (speedup {:.2f}), move {}, "
+              "score {}".format(processesNumber, stats['depth'], stats['nodes'], stats['time'] * 1000,
+                                oneProcessTime / stats['time'], move, score))
+        print("    time to depth: " + ", ".join("{}: {:.0f} ms".format(completedDepth, seconds * 1000)
+                                                for completedDepth, seconds in sorted(stats['depthTimes'].items())))
+
+
+# positions where the player to move has a forced win that alpha_beta does not see at depth 4 (the player to move is
+# last), and the start of the game (the hounds can always win)
+knownWonPositions = [
+    ([' *ci ', '*c***', ' **c '], 0, 'c'),
+    ([' c*i ', '***c*', ' c** '], 0, 'i'),
+    ([' c** ', '***i*', ' cc* '], 0, 'i'),
+    ([' c** ', 'c*c**', ' *i* '], 2, 'c'),
+    ([' c** ', '*c*i*', ' c** '], 0, 'c'),
+    ([' *** ', 'cc**i', ' *c* '], 1, 'c'),
+    ([' *c* ', '*c*ci', ' *** '], 1, 'i'),
+    ([' *c* ', '****i', ' cc* '], 3, 'i'),
+    ([' *** ', 'cc*c*', ' *i* '], 0, 'i'),
+    ([' *c* ', '*c***', ' c*i '], 0, 'c'),
+]
+
+
+# the time of the proof-number search to solve the known-won positions, against the depth and the time alpha_beta
+# needs to find the win (iterative deepening up to maxDepth)
+def benchmarkProofNumber(nodeLimit=100000, maxDepth=8, difficulty=10):
+    positions = [(Game([list(row) for row in table], houndsVerticalMoves), currentPlayer)
+                 for table, houndsVerticalMoves, currentPlayer in knownWonPositions]
+    positions.append((initialGame(), 'c'))
+    for index, (position, currentPlayer) in enumerate(positions):
+        nextGame, stats = proofNumberMove(position, currentPlayer, nodeLimit)
+        print("Position {} ({} to move): proof-number search {} in {} positions, {:.0f} ms".format(
+            index, currentPlayer, {True: "won", False: "not won", None: "not solved"}[stats['proven']],
+            stats['nodes'], stats['time'] * 1000))
+
+        timeBefore = time.perf_counter()
+        for depth in range(1, maxDepth + 1):
+            move, score, searchStats = search(position, currentPlayer, depth=depth, difficulty=difficulty,
+                                              repetitionDetection=False)
+            if score >= 999:
+                print("    alpha_beta finds the win at depth {} after {:.0f} ms".format(
+                    depth, (time.perf_counter() - timeBefore) * 1000))
+                break
+        else:
+            print("    alpha_beta does not find the win until depth {} ({:.0f} ms)".format(
+                maxDepth, (time.perf_counter() - timeBefore) * 1000))
@@ -0,0 +1,447 @@
+# the search of the original script (before the hare_hounds package), kept as it was for the regression checks
+# (see regression.py); only the interface was removed, the code of the search must not be changed
+# the players are class variables (Game.JMAX - the computer, Game.JMIN): legacySearch sets them only for its search,
+# under legacyLock, and clears them after it, so the legacy search can not be used by two threads at the same time
+import copy
+import threading
+from cmath import sqrt
+
+from scipy.spatial.distance import cityblock
+
+
+# returns all possible moves; 8 directions
+def allMoves(row, column):
+    # top
+    topMove = [row - 1, column]
+    # top-right
+    topRightMove = [row - 1, column + 1]
+    # right
+    rightMove = [row, column + 1]
+    # bottom-right
+    bottomRightMove = [row + 1, column + 1]
+    # bottom
+    bottomMove = [row + 1, column]
+    # bottom-left
+    bottomLeftMove = [row + 1, column - 1]
+    # left
+    leftMove = [row, column - 1]
+    # top-left
+    topLeftMove = [row - 1, column - 1]
+
+    return [topMove, topRightMove, rightMove, bottomRightMove, bottomMove, bottomLeftMove, leftMove, topLeftMove]
+
+
+# if given positions are within the bounds of the game board
+def withinBounds(positionX, positionY):
+    if 0 <= positionX < 3 and 0 <= positionY < 5:
+        return True
+    return False
+
+
+class Game:
+    # player symbols
+    playerSymbols = ['c', 'i']
+
+    # the game table
+    gameTable = [[' ', 1, 4, 7, ' '],
+                 [0, 2, 5, 8, 10],
+                 [' ', 3, 6, 9, ' ']]
+
+    # the empty space on the matrix
+    gameGoal = '*'
+
+    impossibleMoves = [[0, 0], [2, 0], [0, 4], [2, 4]]  # the edges from the matrix where is an empty space
+
+    # can not move (from) -> (to) because those positions are not connected between them
+    # I did not exclude the ones that are the same as in hare movement because the hounds can not go backwards
+    houndsInvalidMoves = [[(1, 1), (0, 2)],
+                          [(1, 1), (2, 2)],
+                          [(0, 2), (1, 3)],
+                          [(2, 2), (1, 3)]]
+
+    # the hare can move in any direction so I exclude every direction possible of invalid movements
+    hareInvalidMovements = houndsInvalidMoves + [[(0, 2), (1, 1)],
+                                                 [(2, 2), (1, 1)],
+                                                 [(1, 3), (0, 2)],
+                                                 [(1, 3), (2, 2)]]
+    JMIN = None
+    JMAX = None
+
+    def __init__(self, table, houndsVerticalMoves):
+        self.table = table  # current table during the game
+        self.houndsVerticalMoves = houndsVerticalMoves
+
+    # finding the position of a hare on the table
+    # symbol is a string of 'c' or 'i'
+    def findSymbolPosition(self, symbol):
+        for i in range(3):
+            for j in range(5):
+                if self.table[i][j] == symbol:
+                    return i, j
+        return -1, -1
+
+    def getPositionFromGameTable(self, position):
+        for i in range(3):
+            for j in range(5):
+                if self.gameTable[i][j] == position:
+                    return i, j
+        return -1, -1
+
+    # given coordinates where to go, check if from the current position, you can reach the given destination
+    # function used for checking the user's input
+    def checkIfYouCanGo(self, currentPlayer, rowDestinationToReach, columnDestinationToReach,
+                        rowHoundFrom=None,
+                        columnHoundFrom=None):  # used when a hound moves so whe know which one to move
+        if currentPlayer == 'i':
+            rowFrom, colFrom = self.findSymbolPosition('i')
+            # if the move from the current position to the destination (from input) is reachable
+            if self.legalMove(currentPlayer, rowFrom, colFrom, rowDestinationToReach, columnDestinationToReach):
+                return True
+        else:
+            # if the move from the current position to the destination (from input) is reachable
+            if self.legalMove(currentPlayer, rowHoundFrom, columnHoundFrom, rowDestinationToReach,
+                              columnDestinationToReach):
+                return True
+
+        return False
+
+    # function to check if the current player movement is valid from their current position to given coordinates
+    def legalMove(self, currentPlayer, rowFrom, colFrom, rowTo, colTo):
+        # to check how far apart is the current position from the position to go
+        rowDiff = abs(rowFrom - rowTo)
+        colDiff = abs(colFrom - colTo)
+
+        # if the position is greater than 1, then it is an invalid position to go
+        if rowDiff > 1 or colDiff > 1:
+            return False
+
+        if not withinBounds(rowTo, colTo):
+            return False
+
+        if currentPlayer == 'c':
+            if colTo - colFrom < 0:  # hounds can not move behind their current position
+                return False
+            # if they can move with a valid movement and the position is not occupied already
+            if self.table[rowTo][colTo] == self.gameGoal:
+                if [rowTo, colTo] not in self.impossibleMoves:
+                    for invalidMovement in self.houndsInvalidMoves:
+                        if [(rowFrom, colFrom), (rowTo, colTo)] == invalidMovement:
+                            return False
+
+        # the hare can move in any direction without any restriction of their current position and the next position
+        if currentPlayer == 'i':
+            # if they can move with a valid movement and the position is not occupied already
+            if self.table[rowTo][colTo] == self.gameGoal:
+                if [rowTo, colTo] not in self.impossibleMoves:
+                    for invalidMovement in self.hareInvalidMovements:
+                        if [(rowFrom, colFrom), (rowTo, colTo)] == invalidMovement:
+                            return False
+
+        return True
+
+    # function to generate the next moves from the current position of the current player
+    def generateNextMoves(self, currentPlayer):
+        movesList = []
+
+        if currentPlayer == 'i':  # hare
+            rowFrom, colFrom = self.findSymbolPosition(currentPlayer)
+            if rowFrom != -1 and colFrom != -1:
+                hareMoves = allMoves(rowFrom, colFrom)  # hare movements are almost in every direction
+                for [rowTo, colTo] in hareMoves:
+                    if withinBounds(rowTo, colTo) and self.table[rowTo][colTo] == Game.gameGoal:
+                        if self.legalMove(currentPlayer, rowFrom, colFrom, rowTo, colTo):
+                            # creating a new table game with current settings
+                            newTableGame = copy.deepcopy(self.table)
+                            # setting current position to empty space
+                            newTableGame[rowFrom][colFrom] = self.gameGoal
+                            # moving the position of the player
+                            newTableGame[rowTo][colTo] = currentPlayer
+                            movesList.append(Game(newTableGame, self.houndsVerticalMoves))
+
+        if currentPlayer == 'c':
+            for i in range(3):  # finding the positions of the all hounds
+                for j in range(5):
+                    if self.table[i][j] == 'c':
+                        rowFrom, colFrom = i, j
+                        houndMoves = allMoves(rowFrom, colFrom)
+                        for [rowTo, colTo] in houndMoves:
+                            if withinBounds(rowTo, colTo) and self.table[rowTo][colTo] == Game.gameGoal:
+                                if self.legalMove(currentPlayer, rowFrom, colFrom, rowTo, colTo):
+                                    # creating a new table game with current settings
+                                    newTableGame = copy.deepcopy(self.table)
+                                    # setting current position to empty space
+                                    newTableGame[rowFrom][colFrom] = self.gameGoal
+                                    # moving the position of the player
+                                    newTableGame[rowTo][colTo] = currentPlayer
+                                    # if they move vertically all the time
+                                    if colFrom == colTo:
+                                        movesList.append(Game(newTableGame, self.houndsVerticalMoves + 1))
+                                    else:
+                                        movesList.append(Game(newTableGame, 0))
+
+        return movesList
+
+    def finalGame(self):
+        if self.houndsVerticalMoves >= 10:
+            return 'i'
+
+        rowFrom, colFrom = self.findSymbolPosition('i')
+        # if all hounds are after the hare, then the hare wins
+        houndsNumber = 0
+        if rowFrom != -1 and colFrom != -1:
+            for i in range(3):
+                for j in range(5):
+                    if self.table[i][j] == 'c' and j > colFrom:
+                        houndsNumber += 1
+
+        if houndsNumber == 3:
+            return 'i'
+
+        # find if the hare is surrounded by hounds, then the hounds can still win
+        ok = 0
+        directions = allMoves(rowFrom, colFrom)
+        if rowFrom != -1 and colFrom != -1:
+            for [rowTo, colTo] in directions:
+                if withinBounds(rowTo, colTo):
+                    # find if there is a valid move to a empty place to move for hare so it is not game over for her
+                    if self.table[rowTo][colTo] == self.gameGoal:
+                        if self.legalMove('i', rowFrom, colFrom, rowTo, colTo):
+                            ok = 1
+                            break
+        if ok == 0:
+            return 'c'
+
+        return False  # the game is not finished yet
+
+    # score estimation using euclidean distance
+    # it is used for a easier game
+    def scoreCalculation2(self, currentPlayer):
+        rowFromHare, colFromHare = self.findSymbolPosition('i')
+
+        houndsPositions = []
+        for i in range(3):
+            for j in range(5):
+                if self.table[i][j] == 'c':
+                    houndsPositions.append([i, j])
+
+        # euclidean distance
+        distanceHound1 = (
+            sqrt((houndsPositions[0][0] - rowFromHare) ** 2 + (houndsPositions[0][1] - colFromHare) ** 2)).real
+        distanceHound2 = (
+            sqrt((houndsPositions[1][0] - rowFromHare) ** 2 + (houndsPositions[1][1] - colFromHare) ** 2)).real
+        distanceHound3 = (
+            sqrt((houndsPositions[2][0] - rowFromHare) ** 2 + (houndsPositions[2][1] - colFromHare) ** 2)).real
+
+        if currentPlayer == 'i':
+            score = 0
+            if colFromHare > houndsPositions[0][1]:
+                score += distanceHound1 - 1  # points for being away from hounds
+            elif colFromHare == houndsPositions[0][1]:
+                score += distanceHound1
+            else:
+                score += 5  # bonus points if he passes a hound
+
+            if colFromHare > houndsPositions[1][1]:
+                score += distanceHound2 - 1
+            elif colFromHare == houndsPositions[1][1]:
+                score += distanceHound2
+            else:
+                score += 5  # bonus points if he passes a hound
+
+            if colFromHare > houndsPositions[2][1]:
+                score += distanceHound3 - 1
+            elif colFromHare == houndsPositions[2][1]:
+                score += distanceHound3
+            else:
+                score += 5  # bonus points if he passes a hound
+        else:
+            # calculating the mean distance between the hounds and the hare
+            score = (distanceHound1 + distanceHound2 + distanceHound3) / 3
+        return score
+
+    # score estimation using manhattan distance
+    # it is used for a harder game
+    def scoreCalculation(self, currentPlayer):
+        rowFromHare, colFromHare = self.findSymbolPosition('i')
+        harePosition = [[rowFromHare, colFromHare]]
+        houndsPositions = []
+        for i in range(3):
+            for j in range(5):
+                if self.table[i][j] == 'c':
+                    houndsPositions.append([i, j])
+
+        # manhattan distance (a bit better because it is a grid style)
+        distanceHound1 = cityblock(houndsPositions[0], harePosition[0])
+        distanceHound2 = cityblock(houndsPositions[1], harePosition[0])
+        distanceHound3 = cityblock(houndsPositions[2], harePosition[0])
+
+        if currentPlayer == 'i':
+            score = 0
+            if colFromHare > houndsPositions[0][1]:
+                score += distanceHound1 - 1
+            elif colFromHare == houndsPositions[0][1]:
+                score += distanceHound1
+            else:
+                score += 5  # bonus points if he passes a hound
+
+            if colFromHare > houndsPositions[1][1]:
+                score += distanceHound2 - 1
+            elif colFromHare == houndsPositions[1][1]:
+                score += distanceHound2
+            else:
+                score += 5  # bonus points if he passes a hound
+
+            if colFromHare > houndsPositions[2][1]:
+                score += distanceHound3 - 1
+            elif colFromHare == houndsPositions[2][1]:
+                score += distanceHound3
+            else:
+                score += 5  # bonus points if he passes a hound
+        else:
+            score = (distanceHound1 + distanceHound2 + distanceHound3) / 3
+            # how far apart are the hounds
+            distanceHound12 = cityblock(houndsPositions[0], houndsPositions[1])
+            distanceHound13 = cityblock(houndsPositions[0], houndsPositions[2])
+            distanceHound23 = cityblock(houndsPositions[1], houndsPositions[2])
+
+            # grouping them together => dropping useless states that can lose the game
+            score -= distanceHound12 + distanceHound13 + distanceHound23
+        return score
+
+    # a harder game (7-10 difficulty)
+    def heuristicCalculation(self):
+        return self.scoreCalculation(self.JMAX) - self.scoreCalculation(self.JMIN)
+
+    # a bit easier game (1-6 difficulty)
+    def heuristicCalculation2(self):
+        return self.scoreCalculation2(self.JMAX) - self.scoreCalculation2(self.JMIN)
+
+    def scoreEstimation(self, depth, difficulty):
+        t_final = self.finalGame()
+        if t_final == self.JMAX:
+            return 999 + depth
+        elif t_final == self.JMIN:
+            return -999 - depth
+        else:
+            if 1 <= difficulty <= 6:
+                return self.heuristicCalculation2()
+            else:
+                return self.heuristicCalculation()
+
+
+# Solve class is not changing during the game
+class Solve:
+    maxDepth = None
+
+    # Solve constructor
+    def __init__(self, gameTable, currentGame, depth, score=None):
+        self.gameTable = gameTable  # Game type
+        self.currentGame = currentGame  # current player game
+        self.currentDepth = depth
+        self.currentScore = score
+        self.listOfPossibleMovesOfCurrentGame = []
+        self.chosenMove = None
+
+    def __str__(self):
+        return str(self.gameTable) + "(Current game: " + self.currentGame + ")\n"
+
+    # function to change the current player
+    def changePlayer(self):
+        if self.currentGame == Game.JMIN:
+            return Game.JMAX
+        else:
+            return Game.JMIN
+
+    def startMoving(self):
+        # Generate the moves for the current game
+        movesOfCurrentGame = self.gameTable.generateNextMoves(self.currentGame)
+        otherPlayer = self.changePlayer()  # change the current player
+        # generate the list of moves for the changed player
+        listOfMoves = [Solve(oneMove, otherPlayer, self.currentDepth - 1) for oneMove in movesOfCurrentGame]
+
+        return listOfMoves
+
+
+# min_max function algorithm
+# difficulty = the difficulty of the game
+def min_max(currentState, difficulty):  # stare -> Solve type
+    if currentState.currentDepth == 0 or currentState.gameTable.finalGame():
+        currentState.currentScore = currentState.gameTable.scoreEstimation(currentState.currentDepth, difficulty)
+        return currentState
+
+    currentState.listOfPossibleMovesOfCurrentGame = currentState.startMoving()
+
+    scoreAfterMoving = [min_max(oneMove, difficulty) for oneMove in currentState.listOfPossibleMovesOfCurrentGame]
+
+    if currentState.currentGame == Game.JMAX:
+        currentState.chosenMove = max(scoreAfterMoving, key=lambda x: x.currentScore)
+    else:
+        currentState.chosenMove = min(scoreAfterMoving, key=lambda x: x.currentScore)
+
+    currentState.currentScore = currentState.chosenMove.currentScore
+
+    return currentState
+
+
+# alpha beta function algorithm
+def alpha_beta(alpha, beta, currentState, difficulty):
+    if currentState.currentDepth == 0 or currentState.gameTable.finalGame():
+        currentState.currentScore = currentState.gameTable.scoreEstimation(currentState.currentDepth, difficulty)
+        return currentState
+
+    if alpha > beta:
+        return currentState
+
+    currentState.listOfPossibleMovesOfCurrentGame = currentState.startMoving()
+
+    if currentState.currentGame == Game.JMAX:
+        currentScore = float('-inf')
+
+        for oneMove in currentState.listOfPossibleMovesOfCurrentGame:
+            newState = alpha_beta(alpha, beta, oneMove, difficulty)
+
+            if currentScore < newState.currentScore:
+                currentState.chosenMove = newState
+                currentScore = newState.currentScore
+
+            if alpha < newState.currentScore:
+                alpha = newState.currentScore
+                if alpha >= beta:
+                    break
+
+    elif currentState.currentGame == Game.JMIN:
+        currentScore = float('inf')
+
+        for oneMove in currentState.listOfPossibleMovesOfCurrentGame:
+            newState = alpha_beta(alpha, beta, oneMove, difficulty)
+
+            if currentScore > newState.currentScore:
+                currentState.chosenMove = newState
+                currentScore = newState.currentScore
+
+            if beta > newState.currentScore:
+                beta = newState.currentScore
+                if alpha >= beta:
+                    break
+
+    currentState.currentScore = currentState.chosenMove.currentScore
+
+    return currentState
+
+
+legacyLock = threading.Lock()
+
+
+# the search of the original script for the player side from the table (the legacy Game and Solve are used)
+# algorithm = '1' (min_max) or '2' (alpha_beta); returns the chosen state (legacy Solve type)
+def legacySearch(table, houndsVerticalMoves, side, algorithm, depth, difficulty):
+    with legacyLock:
+        Game.JMAX = side
+        Game.JMIN = 'i' if side == 'c' else 'c'
+        try:
+            currentState = Solve(Game([row.copy() for row in table], houndsVerticalMoves), side, depth)
+            if algorithm == '1':
+                return min_max(currentState, difficulty)
+            return alpha_beta(-5000, 5000, currentState, difficulty)
+        finally:
+            Game.JMAX = Game.JMIN = None
@@ -0,0 +1,380 @@
+import json
+import os
+import random
+import tempfile
+import time
+
+from hare_hounds.batch import BatchGenerator, batchWinners
+from hare_hounds.board import Board
+from hare_hounds.cache import MoveCache, defaultCacheMemory
+from hare_hounds.game import Game, HeuristicWeights, initialGame, otherPlayer
+from hare_hounds.parallel import parallelSearch
+from hare_hounds.proof import ProofNumberSearch
+from hare_hounds.records import RECORD_MAX_DEPTH, GameRecordReader, GameRecordWriter, encodeMove, recordSettings, \
+    replayGameRecords
+from hare_hounds.search import countSearchedNodes, search
+
+from .legacy import legacySearch
+
+# performance regression checks against the search of the original script (legacy.py)
+# every position of the corpus is searched with the legacy search and with search.search, with both algorithms and
+# both heuristics (difficulty 3 - heuristicCalculation2, 9 - heuristicCalculation); the repetition detection is off,
+# because it changes the scores on purpose
+# tolerance: the scores can differ by at most scoreTolerance (the heuristics add the same numbers, so they are
+# equal now) and the move can be the mirror of the legacy move (the mirror reduction searches only one of them)
+# the search is also run on positions with a small MoveCache (the cache of the console and pygame games): the entries
+# are removed all the time, and the moves and the scores must be exactly the ones of the search without the cache
+# the batched positions (BatchGenerator) must give exactly the results of the Game methods, every position solved
+# by the proof-number search must have the result of the full solve of the game, and parallelSearch must give the
+# scores of search.search (exactly: the transposition table only uses scores of the same depth); random games are
+# written to a game record file, read back and replayed
+# performance: the speedup against the legacy search on the same machine (legacy time / current time) must not drop
+# more than speedupTolerance below the stored baseline, the current search must not search more positions, and the
+# search of the corpus with the move cache of the games (cacheTimingSettings) must be faster than without it
+regressionDirectory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+regressionCorpusFile = os.path.join(regressionDirectory, 'regressionCorpus.json')
+regressionBaselineFile = os.path.join(regressionDirectory, 'regressionBaseline.json')
+
+# (algorithm, depth, difficulty) used for every position of the corpus
+regressionSettings = [('1', 3, 3), ('1', 3, 9), ('2', 4, 3), ('2', 4, 9)]
+scoreTolerance = 1e-9
+speedupTolerance = 0.25
+# the memory limit of the move cache of the checks (small, so the least recently used entries are removed)
+regressionCacheMemory = 16 * 1024
+# (depth, processes) of the checks of parallelSearch (the transpositions of depth 7 found the scores of other depths)
+parallelSettings = [(7, 1), (7, 2)]
+# (algorithm, depth, difficulty) of the timing of the move cache (deeper, like the searches of the games)
+cacheTimingSettings = [('2', 6, 9)]
+# the boards and the weights (not the default ones, like tuned weights) of the checks of the batched positions
+regressionBoards = [(3, 5), (3, 7), (5, 9)]
+regressionWeights = HeuristicWeights({'hareDistance': 0.37, 'houndsPassed': 4.3, 'houndsSpread': 0.11},
+                                     {'houndsDistance': 1.7, 'houndsSpread': 0.2})
+
+
+# the positions of the corpus from random games (the positions where the player to move can move)
+def generateRegressionCorpus(positionsNumber=24, seed=2026, path=regressionCorpusFile):
+    generator = random.Random(seed)
+    corpus = []
+    while len(corpus) < positionsNumber:
+        game = initialGame()
+        currentPlayer = Game.playerSymbols[0]
+        for _ in range(generator.randint(0, 30)):
+            nextMoves = game.generateNextMoves(currentPlayer)
+            if game.finalGame() or not nextMoves:
+                break
+            game = generator.choice(nextMoves)
+            currentPlayer = otherPlayer(currentPlayer)
+        if not game.finalGame() and game.generateNextMoves(currentPlayer):
+            corpus.append({'table': [''.join(row) for row in game.table],
+                           'houndsVerticalMoves': game.houndsVerticalMoves, 'player': currentPlayer})
+    with open(path, 'w') as file:
+        json.dump(corpus, file, indent=4)
+    return corpus
+
+
+def loadRegressionCorpus(path=regressionCorpusFile):
+    with open(path) as file:
+        return [(Game([list(row) for row in position['table']], position['houndsVerticalMoves']), position['player'])
+                for position in json.load(file)]
+
+
+# searches all the corpus with both searches; returns the differences (one message for every one) and the totals
+# moveCache = also search every position with this MoveCache (not timed) and compare it with both searches
+def compareWithLegacy(corpus, moveCache=None):
+    differences = []
+    totals = {'legacyTime': 0, 'currentTime': 0, 'legacyNodes': 0, 'currentNodes': 0, 'mirroredMoves': 0}
+    for index, (position, side) in enumerate(corpus):
+        for algorithm, depth, difficulty in regressionSettings:
+            timeBefore = time.perf_counter()
+            legacyState = legacySearch(position.table, position.houndsVerticalMoves, side, algorithm, depth,
+                                       difficulty)
+            totals['legacyTime'] += time.perf_counter() - timeBefore
+            totals['legacyNodes'] += countSearchedNodes(legacyState)
+
+            move, score, stats = search(position, side, algorithm, depth=depth, difficulty=difficulty,
+                                        repetitionDetection=False)
+            totals['currentTime'] += stats['time']
+            totals['currentNodes'] += stats['nodes']
+
+            case = "position {}, algorithm {}, depth {}, difficulty {}".format(index, algorithm, depth, difficulty)
+            legacyTable = legacyState.chosenMove.gameTable.table
+            currentTable = position.playMove(side, *move).table
+            if currentTable != legacyTable:
+                if currentTable == list(reversed(legacyTable)):
+                    totals['mirroredMoves'] += 1
+                else:
+                    differences.append("{}: move {} is not the legacy move".format(case, move))
+            if abs(score - legacyState.currentScore) > scoreTolerance:
+                differences.append("{}: score {} (legacy {})".format(case, score, legacyState.currentScore))
+
+            if moveCache is not None:
+                cachedPosition = Game([row.copy() for row in position.table], position.houndsVerticalMoves,
+                                      position.board, position.weights, moveCache)
+                cachedMove, cachedScore, cachedStats = search(cachedPosition, side, algorithm, depth=depth,
+                                                              difficulty=difficulty, repetitionDetection=False)
+                if (cachedMove, cachedScore, cachedStats['nodes']) != (move, score, stats['nodes']):
+                    differences.append("{}: with the move cache move {}, score {}, {} nodes (without the cache "
+                                       "move {}, score {}, {} nodes)".format(case, cachedMove, cachedScore,
+                                                                             cachedStats['nodes'], move, score,
+                                                                             stats['nodes']))
+    return differences, totals
+
+
+# searches all the corpus with parallelSearch (parallelSettings) and search.search; returns the differences of the
+# scores
+def compareParallelSearch(corpus):
+    differences = []
+    for index, (position, side) in enumerate(corpus):
+        scores = {}  # depth -> the score of search.search
+        for depth, processesNumber in parallelSettings:
+            if depth not in scores:
+                scores[depth] = search(position, side, depth=depth)[1]
+            parallelScore = parallelSearch(position, side, depth=depth, processesNumber=processesNumber)[1]
+            if abs(parallelScore - scores[depth]) > scoreTolerance:
+                differences.append("position {}, depth {}, {} processes: parallel score {} (search {})".format(
+                    index, depth, processesNumber, parallelScore, scores[depth]))
+    return differences
+
+
+# the time of the search of all the corpus with cacheTimingSettings, with an empty MoveCache of memoryLimit bytes
+# (None - without the cache)
+def timeMoveCache(corpus, memoryLimit=None):
+    moveCache = MoveCache(memoryLimit) if memoryLimit is not None else None
+    timeBefore = time.perf_counter()
+    for position, side in corpus:
+        cachedPosition = Game([row.copy() for row in position.table], position.houndsVerticalMoves, position.board,
+                              position.weights, moveCache)
+        for algorithm, depth, difficulty in cacheTimingSettings:
+            search(cachedPosition, side, algorithm, depth=depth, difficulty=difficulty, repetitionDetection=False)
+    return time.perf_counter() - timeBefore
+
+
+# random positions from random games (with the player to move), generator = random.Random
+def randomPositions(positionsNumber, generator, board, weights):
+    positions = []
+    while len(positions) < positionsNumber:
+        game = initialGame(board, weights)
+        currentPlayer = Game.playerSymbols[0]
+        for _ in range(generator.randint(0, 40)):
+            nextMoves = game.generateNextMoves(currentPlayer)
+            if game.finalGame() or not nextMoves:
+                break
+            game = generator.choice(nextMoves)
+            currentPlayer = otherPlayer(currentPlayer)
+            positions.append((game, currentPlayer))
+    return positions[:positionsNumber]
+
+
+# the batched positions against the Game methods on every board of regressionBoards: the next positions (and their
+# order), the end of the game, both heuristics and scoreEstimation; returns the differences and the positions checked
+def compareBatchGenerator(positionsNumber=150, seed=2026):
+    differences = []
+    generator = random.Random(seed)
+    for rows, columns in regressionBoards:
+        board = Board(rows, columns)
+        batchGenerator = BatchGenerator(board, regressionWeights)
+        games = [game for game, currentPlayer in randomPositions(positionsNumber, generator, board,
+                                                                 regressionWeights)]
+        positions = batchGenerator.fromGames(games)
+        case = "board {}x{}".format(rows, columns)
+        if [game.table for game in batchGenerator.toGames(positions)] != [game.table for game in games]:
+            differences.append("{}: the batched positions are not the Game positions".format(case))
+
+        for currentPlayer in Game.playerSymbols:
+            nextPositions, parents = batchGenerator.generateNextMoves(positions, currentPlayer)
+            batchMoves = [(int(parent), nextGame.positionKey())
+                          for parent, nextGame in zip(parents, batchGenerator.toGames(nextPositions))]
+            gameMoves = [(index, nextGame.positionKey()) for index, game in enumerate(games)
+                         for nextGame in game.generateNextMoves(currentPlayer)]
+            if batchMoves != gameMoves:
+                differences.append("{}: different next positions for {}".format(case, currentPlayer))
+
+            for difficulty in [3, 9]:
+                if list(batchGenerator.scoreEstimation(positions, 2, difficulty, currentPlayer)) != \
+                        [game.scoreEstimation(2, difficulty, currentPlayer) for game in games]:
+                    differences.append("{}: different scores for {}, difficulty {}".format(case, currentPlayer,
+                                                                                         difficulty))
+            if list(batchGenerator.heuristicCalculation(positions, currentPlayer)) != \
+                    [game.heuristicCalculation(currentPlayer) for game in games] or \
+                    list(batchGenerator.heuristicCalculation2(positions, currentPlayer)) != \
+                    [game.heuristicCalculation2(currentPlayer) for game in games]:
+                differences.append("{}: different heuristics for {}".format(case, currentPlayer))
+
+        if [batchWinners[int(winner)] for winner in batchGenerator.finalGame(positions)] != \
+                [game.finalGame() for game in games]:
+            differences.append("{}: different ends of the game".format(case))
+    return differences, positionsNumber * len(regressionBoards)
+
+
+# a random game from the start (at most maxMoves moves), generator = random.Random
+# returns the recorded game: (settings, encoded moves, winner)
+def randomRecordedGame(generator, maxMoves):
+    game = initialGame()
+    currentPlayer = Game.playerSymbols[0]
+    moves = []
+    while not game.finalGame() and len(moves) < maxMoves:
+        nextMoves = game.generateNextMoves(currentPlayer)
+        if not nextMoves:
+            break
+        nextGame = generator.choice(nextMoves)
+        moves.append(encodeMove(*game.findMoveTo(nextGame, currentPlayer)))
+        game = nextGame
+        currentPlayer = otherPlayer(currentPlayer)
+    settings = recordSettings(generator.choice('12'), generator.randint(1, 10), generator.randint(1, RECORD_MAX_DEPTH),
+                              generator.choice(Game.playerSymbols))
+    return settings, moves, game.finalGame()
+
+
+def raisesValueError(function):
+    try:
+        function()
+    except ValueError:
+        return True
+    return False
+
+
+# the round trip of the game records: random games (the first ones left before the end) are written in two parts
+# (the second writer appends to the file), read back and replayed; a file cut off inside a header or inside the moves
+# of a game must not be read, and a file of another format must not be appended to
+# returns the differences and the number of games
+def compareGameRecords(gamesNumber=20, seed=2026):
+    differences = []
+    generator = random.Random(seed)
+    games = [randomRecordedGame(generator, 5 if index < 2 else 200) for index in range(gamesNumber)]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'games.hhgr')
+        for part in [games[:gamesNumber // 2], games[gamesNumber // 2:]]:
+            with GameRecordWriter(path, fsyncEvery=4) as writer:
+                for settings, moves, winner in part:
+                    writer.writeGame(settings, moves, winner)
+
+        readGames = [(settings, list(moves), winner) for settings, moves, winner in GameRecordReader(path)]
+        if readGames != games:
+            differences.append("the games read from the game records are not the games written")
+        if replayGameRecords(path) != (gamesNumber, sum(len(moves) for settings, moves, winner in games)):
+            differences.append("the replay of the game records has a different number of games or moves")
+
+        with open(path, 'rb') as file:
+            data = file.read()
+        lastMoves = len(games[-1][1])
+        for case, length in [("inside the moves", len(data) - 1), ("inside a header", len(data) - lastMoves - 1)]:
+            truncatedPath = os.path.join(directory, 'truncated.hhgr')
+            with open(truncatedPath, 'wb') as file:
+                file.write(data[:length])
+            if not raisesValueError(lambda: list(GameRecordReader(truncatedPath))):
+                differences.append("the game records cut off {} were read".format(case))
+
+        otherPath = os.path.join(directory, 'other.hhgr')
+        with open(otherPath, 'wb') as file:
+            file.write(b'HHGR' + bytes([0]) + data[5:])
+        if not raisesValueError(lambda: GameRecordWriter(otherPath).close()):
+            differences.append("the games were appended to a file of another version")
+    return differences, gamesNumber
+
+
+# the winner of position with currentPlayer to move when both players play perfectly (solved = the positions already
+# solved, shared by the calls); a player that can not move loses, the same as in the proof-number search
+def solveGame(position, currentPlayer, solved):
+    key = position.positionKey(), currentPlayer
+    if key not in solved:
+        winner = position.finalGame()
+        if not winner:
+            nextPlayer = otherPlayer(currentPlayer)
+            winner = nextPlayer
+            for nextMove in position.generateNextMoves(currentPlayer):
+                if solveGame(nextMove, nextPlayer, solved) == currentPlayer:
+                    winner = currentPlayer
+                    break
+        solved[key] = winner
+    return solved[key]
+
+
+# the proof-number search against the full solve of the game on the start of the game and the corpus: a proven or
+# disproven position must have the same winner and the proven move must keep the win
+# returns the differences and the number of positions solved by the proof-number search
+def compareProofNumberSearch(corpus, nodeLimit=20000):
+    differences = []
+    solved = {}
+    solvedNumber = 0
+    for index, (position, side) in enumerate([(initialGame(), Game.playerSymbols[0])] + corpus):
+        proofSearch = ProofNumberSearch(nodeLimit)
+        proven = proofSearch.prove(position, side)
+        if proven is None:
+            continue
+        solvedNumber += 1
+        case = "start of the game" if index == 0 else "position {}".format(index - 1)
+        if proven != (solveGame(position, side, solved) == side):
+            differences.append("{}: the proof-number search {} the win of {}".format(
+                case, "proved" if proven else "disproved", side))
+        elif proven and solveGame(proofSearch.winningMove(position, side), otherPlayer(side), solved) != side:
+            differences.append("{}: the proven move of {} does not win".format(case, side))
+    return differences, solvedNumber
+
+
+# the regression checks; returns True if they passed
+# the times are the best of timingRounds runs of the corpus; updateBaseline (or no baseline file) stores the results
+# as the new baseline
+def runRegression(corpusPath=regressionCorpusFile, baselinePath=regressionBaselineFile, timingRounds=3,
+                  updateBaseline=False):
+    corpus = loadRegressionCorpus(corpusPath)
+    moveCache = MoveCache(regressionCacheMemory)
+    differences, totals = compareWithLegacy(corpus, moveCache)
+    for _ in range(timingRounds - 1):
+        roundTotals = compareWithLegacy(corpus)[1]
+        totals['legacyTime'] = min(totals['legacyTime'], roundTotals['legacyTime'])
+        totals['currentTime'] = min(totals['currentTime'], roundTotals['currentTime'])
+    totals['speedup'] = totals['legacyTime'] / totals['currentTime']
+    totals['uncachedTime'] = min(timeMoveCache(corpus) for _ in range(timingRounds))
+    totals['cachedTime'] = min(timeMoveCache(corpus, defaultCacheMemory) for _ in range(timingRounds))
+
+    casesNumber = len(corpus) * len(regressionSettings)
+    print("{} searches: {} different, {} mirrored moves".format(casesNumber, len(differences),
+                                                                totals['mirroredMoves']))
+    for difference in differences:
+        print("    " + difference)
+    for engine in ['legacy', 'current']:
+        print("{} search: {} nodes in {:.0f} ms ({:.0f} nodes/s, {:.1f} searches/s)".format(
+            engine, totals[engine + 'Nodes'], totals[engine + 'Time'] * 1000,
+            totals[engine + 'Nodes'] / totals[engine + 'Time'], casesNumber / totals[engine + 'Time']))
+    print("Speedup against the legacy search: {:.2f}x".format(totals['speedup']))
+    print("Move cache of the checks: " + str(moveCache))
+    print("Current search with the move cache of the games: {:.0f} ms ({:.0f} ms without it)".format(
+        totals['cachedTime'] * 1000, totals['uncachedTime'] * 1000))
+    if totals['cachedTime'] >= totals['uncachedTime']:
+        differences.append("the search with the move cache is not faster than the search without it")
+
+    batchDifferences, positionsNumber = compareBatchGenerator()
+    print("Batched positions: {} positions on {} boards, {} different".format(positionsNumber, len(regressionBoards),
+                                                                            len(batchDifferences)))
+    proofDifferences, solvedNumber = compareProofNumberSearch(corpus)
+    print("Proof-number search: {} of {} positions solved, {} different from the full solve".format(
+        solvedNumber, len(corpus) + 1, len(proofDifferences)))
+    parallelDifferences = compareParallelSearch(corpus)
+    print("Parallel search: {} searches, {} different from the search".format(len(corpus) * len(parallelSettings),
+                                                                           len(parallelDifferences)))
+    recordDifferences, gamesNumber = compareGameRecords()
+    print("Game records: {} games written, read and replayed, {} different".format(gamesNumber,
+                                                                                  len(recordDifferences)))
+    for difference in batchDifferences + proofDifferences + parallelDifferences + recordDifferences:
+        print("    " + difference)
+    differences += batchDifferences + proofDifferences + parallelDifferences + recordDifferences
+
+    passed = not differences
+    if os.path.exists(baselinePath) and not updateBaseline:
+        with open(baselinePath) as file:
+            baseline = json.load(file)
+        print("Baseline: {:.2f}x speedup, current search {} nodes in {:.0f} ms".format(
+            baseline['speedup'], baseline['currentNodes'], baseline['currentTime'] * 1000))
+        if totals['currentNodes'] > baseline['currentNodes']:
+            print("The search looks at more positions than the baseline")
+            passed = False
+        if totals['speedup'] < baseline['speedup'] * (1 - speedupTolerance):
+            print("The speedup dropped more than {:.0f}% below the baseline".format(speedupTolerance * 100))
+            passed = False
+    elif passed:
+        with open(baselinePath, 'w') as file:
+            json.dump(totals, file, indent=4)
+        print("The baseline was saved in " + baselinePath)
+
+    print("Regression checks " + ("passed" if passed else "FAILED"))
+    return passed
@@ -0,0 +1,200 @@
+import json
+import os
+import random
+
+import numpy as np
+from scipy.spatial.distance import cityblock
+from scipy.stats import binomtest
+
+from hare_hounds.board import classicBoard
+from hare_hounds.game import Game, HeuristicWeights, defaultWeights, euclideanDistance, heuristicFeatures, \
+    initialGame, otherPlayer
+from hare_hounds.search import Solve, alpha_beta
+
+# the file with the tuned weights of the heuristics, loaded when the game starts
+heuristicWeightsFile = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                    'heuristicWeights.json')
+# the depths of the matches between the fitted and the current weights (the depths chosen in the games, not the small
+# depth of the self-play) and the p-value the fitted weights need to be saved
+matchDepths = [3, 4, 5]
+significanceLevel = 0.05
+
+
+# heuristic weights tuning
+# labelled positions are generated by fast self-play (both players are the computer) and the weights of both heuristics
+# are fitted with a logistic regression: the heuristic of the hare should predict if the hare wins from the position
+# the fitted weights are saved only if they play significantly better than the current ones (matchHeuristicWeights)
+# the weights from the config file (HeuristicWeights) or None if there is no config file
+def loadHeuristicWeights(path=heuristicWeightsFile):
+    if not os.path.exists(path):
+        return None
+    with open(path) as file:
+        config = json.load(file)
+    return HeuristicWeights(config.get('heuristicWeights'), config.get('heuristicWeights2'),
+                            config.get('difficultySplit', defaultWeights.difficultySplit))
+
+
+def saveHeuristicWeights(weights, path=heuristicWeightsFile):
+    with open(path, 'w') as file:
+        json.dump({'heuristicWeights': weights.heuristicWeights, 'heuristicWeights2': weights.heuristicWeights2,
+                   'difficultySplit': weights.difficultySplit}, file, indent=4)
+
+
+# one game played by the computer against itself with alpha-beta at a small depth
+# randomMoves = the probability of a random move (so the games are not all the same)
+# returns the positions after every move and the winner (False if the game was too long)
+def selfPlayGame(depth, difficulty, randomMoves, maxMoves=200, board=classicBoard, weights=defaultWeights):
+    return matchGame(depth, difficulty, randomMoves, weights, weights, maxMoves, board)
+
+
+# one game between two computers: the hounds search with houndsWeights and the hare with hareWeights
+# generator = the random numbers of the random moves (random.Random or the random module)
+def matchGame(depth, difficulty, randomMoves, houndsWeights, hareWeights, maxMoves=200, board=classicBoard,
+              generator=random):
+    playerWeights = {'c': houndsWeights, 'i': hareWeights}
+    game = initialGame(board, houndsWeights)
+    currentPlayer = Game.playerSymbols[0]  # hounds moves first
+    positions = []
+    while not game.finalGame() and len(positions) < maxMoves:
+        nextMoves = game.generateNextMoves(currentPlayer)
+        if not nextMoves:  # the player can not move anymore, so the other player wins
+            return positions, otherPlayer(currentPlayer)
+
+        if generator.random() < randomMoves:
+            game = generator.choice(nextMoves)
+        else:
+            # the current player is the computer (the heuristics are calculated for him, with his weights)
+            searchedGame = Game(game.table, game.houndsVerticalMoves, board, playerWeights[currentPlayer])
+            game = alpha_beta(-5000, 5000, Solve(searchedGame, currentPlayer, depth, currentPlayer),
+                              difficulty).chosenMove.gameTable
+
+        positions.append(game)
+        currentPlayer = otherPlayer(currentPlayer)
+
+    return positions, game.finalGame()
+
+
+# the games won by the candidate weights and by the baseline weights in gamesNumber pairs of games
+# in every pair both weights play once as the hounds and once as the hare, with the same random moves
+def matchHeuristicWeights(candidate, baseline, gamesNumber, depth, difficulty, randomMoves=0.1, seed=2026):
+    wins = {'candidate': 0, 'baseline': 0}
+    for game in range(gamesNumber):
+        for houndsName, hareName in [['candidate', 'baseline'], ['baseline', 'candidate']]:
+            playerWeights = {'candidate': candidate, 'baseline': baseline}
+            winner = matchGame(depth, difficulty, randomMoves, playerWeights[houndsName], playerWeights[hareName],
+                               generator=random.Random(seed + game))[1]
+            if winner:
+                wins[houndsName if winner == 'c' else hareName] += 1
+    return wins['candidate'], wins['baseline']
+
+
+# the p-value of the one-sided binomial test that the candidate weights win more than half of the games that were won
+# by one of the players (the games without a winner are not counted)
+def matchPValue(candidateWins, baselineWins):
+    if candidateWins + baselineWins == 0:
+        return 1.0
+    return binomtest(candidateWins, candidateWins + baselineWins, 0.5, alternative='greater').pvalue
+
+
+# the features of the positions as a matrix; the heuristic of the hare is featureMatrix @ weights
+def featureMatrix(positions, distance):
+    signs = np.array([1, -1, 1, -1, 1])  # the signs from Game.weightedScore
+    return np.array([[position.scoreFeatures(distance)[feature] for feature in heuristicFeatures]
+                     for position in positions], dtype=float) * signs
+
+
+# the weight of every position, so both outcomes have the same total weight (the hare wins most of the self-play
+# games, so without them the model would learn mostly the outcome that is more frequent)
+def balancedSampleWeights(labels):
+    positives = labels.sum()
+    negatives = len(labels) - positives
+    return np.where(labels == 1, len(labels) / (2 * positives), len(labels) / (2 * negatives))
+
+
+def logLoss(features, labels, weights, bias=0, sampleWeights=None):
+    sampleWeights = np.ones(len(labels)) if sampleWeights is None else sampleWeights
+    predictions = 1 / (1 + np.exp(-np.clip(features @ weights + bias, -30, 30)))
+    predictions = np.clip(predictions, 1e-12, 1 - 1e-12)
+    return float(-np.sum(sampleWeights * (labels * np.log(predictions) + (1 - labels) * np.log(1 - predictions))) /
+                 np.sum(sampleWeights))
+
+
+# weighted logistic regression with gradient descent, starting from (and regularised towards) the initial weights
+# the bias takes the part of the outcome that does not depend on the position; it is not a weight of the heuristic
+# (a constant does not change which move is the best), so only the weights are used after the fitting
+# returns (weights, bias)
+def fitHeuristicWeights(features, labels, initialWeights, sampleWeights=None, iterations=3000, learningRate=0.05,
+                        regularisation=0.001):
+    sampleWeights = np.ones(len(labels)) if sampleWeights is None else sampleWeights
+    startWeights = np.array([initialWeights[feature] for feature in heuristicFeatures], dtype=float)
+    weights = startWeights.copy()
+    bias = 0.0
+    for _ in range(iterations):
+        predictions = 1 / (1 + np.exp(-np.clip(features @ weights + bias, -30, 30)))
+        errors = sampleWeights * (predictions - labels) / np.sum(sampleWeights)
+        weights -= learningRate * (features.T @ errors + regularisation * (weights - startWeights))
+        bias -= learningRate * np.sum(errors)
+    return weights, bias
+
+
+# the tuning pipeline: self-play, fitting both heuristics and saving the weights to the config file
+# the self-play and the fitting start from weights; the games must have both outcomes (the positions of both are
+# weighted the same)
+# the fitted weights of a heuristic are kept only if they play matches of matchGames pairs of games against weights
+# at every depth of matchDepths (difficulty 10 uses the manhattan heuristic, 1 the euclidean one), win at least as many
+# games as weights at every depth and win more games in total with a p-value below significanceLevel (matchPValue);
+# the config file is written only if at least one heuristic was better
+def tuneHeuristicWeights(gamesNumber, depth=2, difficulty=10, randomMoves=0.2, weights=defaultWeights,
+                         path=heuristicWeightsFile, matchGames=50, depths=matchDepths):
+    positions = []
+    labels = []
+    for _ in range(gamesNumber):
+        gamePositions, winner = selfPlayGame(depth, difficulty, randomMoves, weights=weights)
+        if winner:
+            positions += gamePositions
+            labels += [1 if winner == 'i' else 0] * len(gamePositions)
+    labels = np.array(labels, dtype=float)
+    print("Labelled positions: " + str(len(labels)) + " (hare wins: " + str(int(labels.sum())) + ")")
+    if labels.sum() == 0 or labels.sum() == len(labels):
+        print("The self-play games need wins of both players, play more games (the weights were not changed)")
+        return False
+    sampleWeights = balancedSampleWeights(labels)
+
+    tunedWeights = {'heuristicWeights': weights.heuristicWeights, 'heuristicWeights2': weights.heuristicWeights2}
+    improved = False
+    for name, distance, weightsName, matchDifficulty in [['manhattan', cityblock, 'heuristicWeights', 10],
+                                                         ['euclidean', euclideanDistance, 'heuristicWeights2', 1]]:
+        initialWeights = tunedWeights[weightsName]
+        features = featureMatrix(positions, distance)
+        startWeights = np.array([initialWeights[feature] for feature in heuristicFeatures], dtype=float)
+        fitted, bias = fitHeuristicWeights(features, labels, initialWeights, sampleWeights)
+        print("Log loss ({}): {:.4f} -> {:.4f}".format(name, logLoss(features, labels, startWeights, 0, sampleWeights),
+                                                        logLoss(features, labels, fitted, bias, sampleWeights)))
+
+        fittedWeights = dict(zip(heuristicFeatures, [round(float(weight), 4) for weight in fitted]))
+        candidate = HeuristicWeights(**{weightsName: fittedWeights}, difficultySplit=weights.difficultySplit)
+        baseline = HeuristicWeights(**{weightsName: initialWeights}, difficultySplit=weights.difficultySplit)
+        candidateWins = baselineWins = 0
+        worseDepths = []
+        for matchDepth in depths:
+            depthWins = matchHeuristicWeights(candidate, baseline, matchGames, matchDepth, matchDifficulty)
+            print("Match at depth {} ({}): fitted weights {} wins, current weights {} wins".format(
+                matchDepth, name, *depthWins))
+            candidateWins += depthWins[0]
+            baselineWins += depthWins[1]
+            if depthWins[0] < depthWins[1]:
+                worseDepths.append(matchDepth)
+        pValue = matchPValue(candidateWins, baselineWins)
+        print("All the matches ({}): fitted weights {} wins, current weights {} wins, p-value {:.4f}".format(
+            name, candidateWins, baselineWins, pValue))
+        if pValue < significanceLevel and not worseDepths:
+            tunedWeights[weightsName] = fittedWeights
+            improved = True
+
+    if not improved:
+        print("The fitted weights did not play significantly better, so they were not saved")
+        return False
+    saveHeuristicWeights(HeuristicWeights(tunedWeights['heuristicWeights'], tunedWeights['heuristicWeights2'],
+                                          weights.difficultySplit), path)
+    print("Heuristic weights saved in " + path)
+    return True